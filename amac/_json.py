@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 import json as _json_std
 from typing import Any
 
@@ -7,18 +8,26 @@ try:  # pragma: no cover - optional dependency
     import orjson as _json_fast  # type: ignore
 except Exception:  # pragma: no cover
     def dumps(obj: Any, *, indent: int = 2) -> bytes:
-        return _json_std.dumps(obj, indent=indent).encode()
+        if indent:
+            encoder = _json_std.JSONEncoder(indent=indent)
+        else:  # match orjson's compact output
+            encoder = _json_std.JSONEncoder(separators=(",", ":"))
+        # Encode chunk by chunk so the full document never exists as a str.
+        buf = io.BytesIO()
+        for chunk in encoder.iterencode(obj):
+            buf.write(chunk.encode())
+        return buf.getvalue()
 
-    def loads(data: bytes | bytearray | str) -> Any:
-        if isinstance(data, (bytes, bytearray)):
-            data = data.decode()
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        if not isinstance(data, str):
+            data = str(data, "utf-8")
         return _json_std.loads(data)
 else:  # pragma: no cover
     def dumps(obj: Any, *, indent: int = 2) -> bytes:
         option = _json_fast.OPT_INDENT_2 if indent == 2 else 0
         return _json_fast.dumps(obj, option=option)
 
-    def loads(data: bytes | bytearray | str) -> Any:
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
         return _json_fast.loads(data)
 
 __all__ = ["dumps", "loads"]
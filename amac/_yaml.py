@@ -1,6 +1,15 @@
+import functools
 import json
 import re
-from typing import Any, List, Tuple
+from typing import Any, List, Optional
+
+_INT_RE = re.compile(r'-?\d+')
+_FLOAT_RE = re.compile(r'-?\d+\.\d*')
+_NUMERIC_START = frozenset('-0123456789')
+_SCALAR_CACHE_MAX_LEN = 64
+# Quoted runs (closed, or left open until end of line) are kept verbatim; a
+# ``#`` outside of them starts a comment that runs to the end of the line.
+_COMMENT_RE = re.compile(r"""'[^'\n]*(?:'|$)|"[^"\n]*(?:"|$)|(#[^\n]*)""", re.M)
 
 
 def safe_load(stream: Any) -> Any:
@@ -14,71 +23,74 @@ def safe_load(stream: Any) -> Any:
         text = stream.read()
     else:
         text = str(stream)
-    lines = _strip_comments(text).splitlines()
-    data, _ = _parse_block(lines, 0, 0)
-    return data
+    return _parse_lines(_strip_comments(text).splitlines())
 
 def _strip_comments(text: str) -> str:
-    out_lines = []
-    for line in text.splitlines():
-        in_single = False
-        in_double = False
-        new_line = []
-        for ch in line:
-            if ch == "'" and not in_double:
-                in_single = not in_single
-            elif ch == '"' and not in_single:
-                in_double = not in_double
-            elif ch == '#' and not in_single and not in_double:
-                break
-            new_line.append(ch)
-        out_lines.append(''.join(new_line))
-    return '\n'.join(out_lines)
-
-def _parse_block(lines: List[str], idx: int, indent: int) -> Tuple[Any, int]:
-    mapping = {}
-    sequence = None
-    n = len(lines)
-    while idx < n:
-        raw = lines[idx]
+    return _COMMENT_RE.sub(_drop_comment, text)
+
+def _drop_comment(m: re.Match) -> str:
+    return '' if m.group(1) else m.group(0)
+
+class _Frame:
+    """One open mapping/sequence block and where its value goes once closed."""
+
+    __slots__ = ('indent', 'mapping', 'sequence', 'parent', 'key')
+
+    def __init__(self, indent: int, parent: Any = None, key: Any = None) -> None:
+        self.indent = indent
+        self.mapping: dict = {}
+        self.sequence: Optional[list] = None
+        # parent is the enclosing dict/list; key is the dict key, None to
+        # append to a list, or ('-', name) for a "- name:" sequence item.
+        self.parent = parent
+        self.key = key
+
+    def value(self) -> Any:
+        return self.sequence if self.sequence is not None else self.mapping
+
+    def close(self) -> None:
+        val = self.value()
+        if self.key is None:
+            self.parent.append(val)
+        elif isinstance(self.key, tuple):
+            self.parent.append({self.key[1]: val})
+        else:
+            self.parent[self.key] = val
+
+
+def _parse_lines(lines: List[str]) -> Any:
+    root = _Frame(0)
+    stack = [root]
+    for raw in lines:
         if not raw.strip():
-            idx += 1
             continue
         cur_indent = len(raw) - len(raw.lstrip(' '))
-        if cur_indent < indent:
-            break
+        while cur_indent < stack[-1].indent:
+            stack.pop().close()
+        frame = stack[-1]
         line = raw.strip()
         if line.startswith('- '):
-            if mapping:
+            if frame.mapping:
                 raise ValueError('mixing list and dict at same level is unsupported')
-            if sequence is None:
-                sequence = []
+            if frame.sequence is None:
+                frame.sequence = []
+            sequence = frame.sequence
             item = line[2:].strip()
             if not item:
-                idx += 1
-                val, idx = _parse_block(lines, idx, cur_indent + 2)
-                sequence.append(val)
+                stack.append(_Frame(cur_indent + 2, sequence))
                 continue
             if item.endswith(':') or ': ' in item:
                 # allow "- key: value" style
                 if item.endswith(':'):
                     key = item[:-1].strip()
-                    idx += 1
-                    val, idx = _parse_block(lines, idx, cur_indent + 4)
-                    sequence.append({key: val})
-                    continue
+                    stack.append(_Frame(cur_indent + 4, sequence, ('-', key)))
                 else:
                     key, rest = item.split(':', 1)
-                    key = key.strip()
-                    rest = rest.strip()
-                    val = _parse_scalar(rest)
-                    idx += 1
-                    sequence.append({key: val})
-                    continue
+                    sequence.append({key.strip(): _parse_scalar(rest.strip())})
+                continue
             sequence.append(_parse_scalar(item))
-            idx += 1
         else:
-            if sequence is not None:
+            if frame.sequence is not None:
                 raise ValueError('mixing list and dict at same level is unsupported')
             if ':' not in line:
                 raise ValueError(f'Invalid line: {line!r}')
@@ -86,16 +98,22 @@ def _parse_block(lines: List[str], idx: int, indent: int) -> Tuple[Any, int]:
             key = key.strip()
             rest = rest.strip()
             if rest:
-                mapping[key] = _parse_scalar(rest)
-                idx += 1
+                frame.mapping[key] = _parse_scalar(rest)
             else:
-                idx += 1
-                val, idx = _parse_block(lines, idx, cur_indent + 2)
-                mapping[key] = val
-    return (sequence if sequence is not None else mapping), idx
+                stack.append(_Frame(cur_indent + 2, frame.mapping, key))
+    while len(stack) > 1:
+        stack.pop().close()
+    return root.value()
 
 def _parse_scalar(token: str) -> Any:
     token = token.strip()
+    # Short plain scalars repeat a lot (true/false/null, small ints, host names).
+    # Flow collections are never cached: they decode to mutable lists/dicts.
+    if len(token) > _SCALAR_CACHE_MAX_LEN or token[:1] in ('[', '{'):
+        return _parse_scalar_impl(token)
+    return _parse_scalar_cached(token)
+
+def _parse_scalar_impl(token: str) -> Any:
     if token == '' or token.lower() in {'null', 'none'}:
         return None
     if token.lower() == 'true':
@@ -107,16 +125,19 @@ def _parse_scalar(token: str) -> Any:
             return json.loads(token)
         except json.JSONDecodeError:
             pass
-    if re.fullmatch(r'-?\d+', token):
-        try:
-            return int(token)
-        except ValueError:
-            pass
-    if re.fullmatch(r'-?\d+\.\d*', token):
-        try:
-            return float(token)
-        except ValueError:
-            pass
+    if token[0] in _NUMERIC_START:
+        if _INT_RE.fullmatch(token):
+            try:
+                return int(token)
+            except ValueError:
+                pass
+        if _FLOAT_RE.fullmatch(token):
+            try:
+                return float(token)
+            except ValueError:
+                pass
     if (token.startswith('"') and token.endswith('"')) or (token.startswith("'") and token.endswith("'")):
         return token[1:-1]
     return token
+
+_parse_scalar_cached = functools.lru_cache(maxsize=2048)(_parse_scalar_impl)
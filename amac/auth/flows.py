@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
 import httpx
 
+from .._json import loads
 from ..models import AuthScheme
 
 
@@ -11,6 +13,32 @@ class AuthFlowError(RuntimeError):
     pass
 
 
+# Token endpoints are hit once per identity and again on every refresh; keep
+# one pooled client per event loop so those requests reuse TLS connections.
+_CLIENT: Optional[httpx.AsyncClient] = None
+_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_client(timeout: float) -> httpx.AsyncClient:
+    global _CLIENT, _CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT.is_closed or _CLIENT_LOOP is not loop:
+        _CLIENT = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+        _CLIENT_LOOP = loop
+    return _CLIENT
+
+
+async def aclose() -> None:
+    """Close the shared token-endpoint client (safe to call when unused)."""
+    global _CLIENT, _CLIENT_LOOP
+    client, _CLIENT, _CLIENT_LOOP = _CLIENT, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
 async def fetch_oauth2_token(s: AuthScheme, *, timeout: float = 15.0) -> str:
     """
     Supports:
@@ -35,21 +63,21 @@ async def fetch_oauth2_token(s: AuthScheme, *, timeout: float = 15.0) -> str:
         data["username"] = s.username or ""
         data["password"] = s.password or ""
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.post(s.token_url, data=data, auth=auth, headers=headers)
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            raise AuthFlowError(f"OAuth2 token request failed: {e}") from e
-
-        js = resp.json()
-        tok = js.get("access_token")
-        if not tok:
-            raise AuthFlowError("OAuth2 response missing access_token")
-        # Optionally capture refresh_token if provided
-        if js.get("refresh_token"):
-            s.refresh_token = js["refresh_token"]
-        return str(tok)
+    client = _get_client(timeout)
+    resp = await client.post(s.token_url, data=data, auth=auth, headers=headers, timeout=timeout)
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        raise AuthFlowError(f"OAuth2 token request failed: {e}") from e
+
+    js = loads(resp.content)
+    tok = js.get("access_token")
+    if not tok:
+        raise AuthFlowError("OAuth2 response missing access_token")
+    # Optionally capture refresh_token if provided
+    if js.get("refresh_token"):
+        s.refresh_token = js["refresh_token"]
+    return str(tok)
 
 
 async def refresh_oauth2_token(s: AuthScheme, *, timeout: float = 15.0) -> Optional[str]:
@@ -64,14 +92,14 @@ async def refresh_oauth2_token(s: AuthScheme, *, timeout: float = 15.0) -> Optio
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     auth = (s.client_id or "", s.client_secret or "")
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.post(s.token_url, data=data, auth=auth, headers=headers)
-        if resp.status_code >= 400:
-            return None
-        js = resp.json()
-        tok = js.get("access_token")
-        if tok:
-            return str(tok)
+    client = _get_client(timeout)
+    resp = await client.post(s.token_url, data=data, auth=auth, headers=headers, timeout=timeout)
+    if resp.status_code >= 400:
+        return None
+    js = loads(resp.content)
+    tok = js.get("access_token")
+    if tok:
+        return str(tok)
     return None
 
 
@@ -88,6 +116,7 @@ async def perform_form_login(s: AuthScheme, *, timeout: float = 15.0) -> str:
     if s.extra_fields:
         payload.update({k: str(v) for k, v in s.extra_fields.items()})
 
+    # A private client on purpose: the cookie jar must only hold this identity's session.
     async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
         resp = await client.request(
             s.login_method or "POST",
@@ -109,20 +138,10 @@ async def perform_form_login(s: AuthScheme, *, timeout: float = 15.0) -> str:
 
 def _cookiejar_to_header(client: httpx.AsyncClient) -> str:
     # Convert cookie jar to "k=v; k2=v2"
-    jar = client.cookies.jar
-    pairs = []
-    for c in jar:
-        if not c.value or not c.name:
-            continue
-        pairs.append(f"{c.name}={c.value}")
-    return "; ".join(pairs)
+    return "; ".join(f"{c.name}={c.value}" for c in client.cookies.jar if c.name and c.value)
 
 
 def _setcookie_to_cookie_header(set_cookie: str) -> str:
     # Very naive: keep only the first "name=value" per cookie
-    cookies = []
-    for part in set_cookie.split(","):
-        kv = part.split(";", 1)[0].strip()
-        if "=" in kv:
-            cookies.append(kv)
-    return "; ".join(cookies)
+    kvs = (part.split(";", 1)[0].strip() for part in set_cookie.split(","))
+    return "; ".join(kv for kv in kvs if "=" in kv)
@@ -1,26 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 from . import __version__
 from ._json import dumps, loads
-from .config import (
-    assert_urls_in_scope,
-    load_auth_config,
-    load_scope_config,
-)
-from .diffing import analyze_run_dir
-from .discovery.openapi import load_and_map_openapi
-from .models import EndpointSet
-from .report import render_report
-from .runner import run_basic_probes
+
+if TYPE_CHECKING:
+    from .models import EndpointSet
+
+# Heavier modules (pydantic models, httpx, the runner/report pipeline, rich.table)
+# are imported inside the commands that need them so `amac --version`/help stay fast.
 
 app = typer.Typer(add_completion=False, help="AMAC — API Mapper + Auth Checker")
 console = Console()
@@ -63,10 +59,33 @@ def version() -> None:  # allows `amac version` as well
 # Helpers
 # -----------------------------
 
+_REQ_AUTH = {True: "yes", False: "no", None: "unknown"}
+
+
+_WRITE_CHUNK = 1 << 16
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
 def _write_json(obj, out_path: Path) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     payload = obj.model_dump() if hasattr(obj, "model_dump") else obj
-    out_path.write_bytes(dumps(payload))
+    data = dumps(payload, indent=0)
+    # Leave an identical file untouched so its mtime (and downstream caches) survive re-runs.
+    if out_path.is_file() and out_path.stat().st_size == len(data) and out_path.read_bytes() == data:
+        return
+    _write_raw(out_path, data)
+
+
+def _write_raw(out_path: Path, data: bytes) -> None:
+    # Straight to the fd: no BufferedWriter copy for MB-sized endpoint sets.
+    fd = os.open(out_path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view[:_WRITE_CHUNK])
+            view = view[written:]
+    finally:
+        os.close(fd)
 
 
 def _read_json(path: Path) -> dict:
@@ -74,6 +93,8 @@ def _read_json(path: Path) -> dict:
 
 
 def _show_endpoints_table(es: EndpointSet, limit: int = 12) -> None:
+    from rich.table import Table
+
     table = Table(title=f"Endpoints ({len(es.endpoints)} total; showing up to {limit})")
     table.add_column("#", style="bold", justify="right")
     table.add_column("Method")
@@ -81,15 +102,25 @@ def _show_endpoints_table(es: EndpointSet, limit: int = 12) -> None:
     table.add_column("Auth Declared?")
     table.add_column("Tags")
 
-    for i, ep in enumerate(es.endpoints[:limit], start=1):
-        req_auth = "yes" if ep.requires_auth is True else "no" if ep.requires_auth is False else "unknown"
-        tags = ", ".join(ep.tags) if ep.tags else "-"
-        table.add_row(str(i), ep.method, ep.url, req_auth, tags)
+    rows = [
+        (
+            str(i),
+            ep.method,
+            ep.url,
+            _REQ_AUTH.get(ep.requires_auth, "unknown"),
+            ", ".join(ep.tags) if ep.tags else "-",
+        )
+        for i, ep in enumerate(es.endpoints[:limit], start=1)
+    ]
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
 
 
 def _show_probe_preview(summary_json: dict, limit: int = 12) -> None:
+    from rich.table import Table
+
     rows = summary_json.get("rows", [])
     table = Table(title=f"Probe Summary ({len(rows)} endpoints; showing up to {limit})")
     table.add_column("#", style="bold", justify="right")
@@ -100,26 +131,26 @@ def _show_probe_preview(summary_json: dict, limit: int = 12) -> None:
     table.add_column("Auth (first)")
     table.add_column("Δ Size")
 
-    def _req_auth(v):
-        return "yes" if v is True else "no" if v is False else "unknown"
-
-    for r in rows[:limit]:
-        no_s = r.get("noauth_status")
-        au_s = r.get("auth_status")
-        no_sz = r.get("noauth_size") or 0
-        au_sz = r.get("auth_size") or 0
+    def _row(r: dict) -> tuple:
+        get = r.get
+        no_s = get("noauth_status")
+        au_s = get("auth_status")
+        no_sz = get("noauth_size") or 0
+        au_sz = get("auth_size") or 0
         dsz = au_sz - no_sz if (au_s is not None and no_s is not None) else 0
-
-        table.add_row(
-            str(r.get("index")),
-            r.get("method", "-"),
-            r.get("url", "-"),
-            _req_auth(r.get("requires_auth")),
+        return (
+            str(get("index")),
+            get("method", "-"),
+            get("url", "-"),
+            _REQ_AUTH.get(get("requires_auth"), "unknown"),
             "-" if no_s is None else str(no_s),
-            "-" if au_s is None else f"{r.get('auth_name','auth')}:{au_s}",
+            "-" if au_s is None else f"{get('auth_name','auth')}:{au_s}",
             str(dsz),
         )
 
+    for row in [_row(r) for r in rows[:limit]]:
+        table.add_row(*row)
+
     console.print(table)
 
 
@@ -127,6 +158,8 @@ def _show_matrix_preview(summary_json: dict, limit: int = 10) -> None:
     """
     RBAC matrix preview: per-identity statuses for first few endpoints.
     """
+    from rich.table import Table
+
     matrix = summary_json.get("matrix", [])
     idents: List[str] = list(summary_json.get("auth_used") or [])
     if not matrix or not idents:
@@ -148,20 +181,26 @@ def _show_matrix_preview(summary_json: dict, limit: int = 10) -> None:
     for name in idents_shown:
         t.add_column(name, justify="center")
 
-    def _cell(status):
-        return "-" if status is None else str(status)
+    no_variant: dict = {}
 
-    for row in matrix[:limit]:
-        vals = [str(row.get("index")), row.get("method", ""), row.get("url", "")]
+    def _row(row: dict) -> list:
+        get = row.get
+        variant_of = (get("variants") or no_variant).get
+        vals = [str(get("index")), get("method", ""), get("url", "")]
         for name in idents_shown:
-            v = row.get("variants", {}).get(name) or {}
-            vals.append(_cell(v.get("status")))
+            status = (variant_of(name) or no_variant).get("status")
+            vals.append("-" if status is None else str(status))
+        return vals
+
+    for vals in [_row(row) for row in matrix[:limit]]:
         t.add_row(*vals)
 
     console.print(t)
 
 
 def _show_findings_preview(findings_json: dict, limit: int = 10) -> None:
+    from rich.table import Table
+
     counts = findings_json.get("counts", {})
     table_top = Table(title="Findings — Summary")
     table_top.add_column("Total Endpoints", justify="right")
@@ -193,16 +232,21 @@ def _show_findings_preview(findings_json: dict, limit: int = 10) -> None:
     table.add_column("URL")
     table.add_column("no->auth")
     table.add_column("Δsize")
-    for i, f in enumerate(items, 1):
-        table.add_row(
+
+    def _row(i: int, get) -> tuple:
+        return (
             str(i),
-            f.get("severity", "").upper(),
-            f.get("type", ""),
-            f.get("method", ""),
-            f.get("url", ""),
-            f"{f.get('noauth_status')}->{f.get('auth_status')}",
-            str(f.get("delta_size")),
+            get("severity", "").upper(),
+            get("type", ""),
+            get("method", ""),
+            get("url", ""),
+            f"{get('noauth_status')}->{get('auth_status')}",
+            str(get("delta_size")),
         )
+
+    rows = [_row(i, f.get) for i, f in enumerate(items, 1)]
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
 
@@ -237,6 +281,9 @@ def map(
     Loads scope.yml, fetches/parses the OpenAPI spec, builds an EndpointSet (GET/HEAD),
     enforces scope, and writes endpoints.json.
     """
+    from .config import load_scope_config
+    from .discovery.openapi import load_and_map_openapi
+
     if not scope.exists():
         console.print(f"[red]Error: scope file not found: {scope}[/red]")
         raise typer.Exit(code=2)
@@ -296,6 +343,9 @@ def check(
       - auth.yml structure (at least one scheme, required fields present)
       - endpoints.json structure, and that all URLs are within scope
     """
+    from .config import assert_urls_in_scope, load_auth_config, load_scope_config
+    from .models import load_endpointset_json
+
     if not scope.exists() or not scope.is_file():
         console.print(f"[red]Error: scope file not found: {scope}[/red]")
         raise typer.Exit(code=2)
@@ -318,14 +368,13 @@ def check(
         raise typer.Exit(code=2)
 
     try:
-        raw = _read_json(endpoints)
-        es = EndpointSet.model_validate(raw)
+        es = load_endpointset_json(endpoints.read_bytes())
     except Exception as e:
         console.print(f"[red]Invalid endpoints.json:[/red] {e}")
         raise typer.Exit(code=2)
 
     try:
-        assert_urls_in_scope([e.url for e in es.endpoints], scope_cfg)
+        assert_urls_in_scope([e.url_parts for e in es.endpoints], scope_cfg)
     except Exception as e:
         console.print(f"[red]Scope violation:[/red] {e}")
         raise typer.Exit(code=2)
@@ -390,6 +439,10 @@ def probe(
 
     Writes per-request snapshots under OUT/requests and a summary at OUT/summary.json.
     """
+    from .config import assert_urls_in_scope, load_auth_config, load_scope_config
+    from .models import load_endpointset_json
+    from .runner import run_basic_probes
+
     if out_dir is None:
         ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         out_dir = Path("out") / f"run_{ts}"
@@ -418,14 +471,13 @@ def probe(
         raise typer.Exit(code=2)
 
     try:
-        raw = _read_json(endpoints)
-        es = EndpointSet.model_validate(raw)
+        es = load_endpointset_json(endpoints.read_bytes())
     except Exception as e:
         console.print(f"[red]Invalid endpoints.json:[/red] {e}")
         raise typer.Exit(code=2)
 
     try:
-        assert_urls_in_scope([e.url for e in es.endpoints], scope_cfg)
+        assert_urls_in_scope([e.url_parts for e in es.endpoints], scope_cfg)
     except Exception as e:
         console.print(f"[red]Scope violation:[/red] {e}")
         raise typer.Exit(code=2)
@@ -449,16 +501,18 @@ def probe(
         f"[green]{'Dry-run planned' if dry_run else 'Probes complete'}.[/green] Summary -> {meta['summary']}\nRequests -> {meta['requests_dir']}"
     )
 
-    if not no_preview:
+    summary_path = Path(meta["summary"])
+    if not no_preview and summary_path.is_file():
         try:
-            summary_json = _read_json(Path(meta["summary"]))
-            if dry_run:
-                console.print(f"[cyan]Planned requests:[/cyan] {summary_json.get('planned_requests', 'n/a')}")
-            else:
-                _show_probe_preview(summary_json)
-                _show_matrix_preview(summary_json)
-        except Exception:
-            pass
+            summary_json = _read_json(summary_path)
+        except (OSError, ValueError) as e:
+            console.print(f"[yellow]Could not read {summary_path} for preview:[/yellow] {e}")
+            return
+        if dry_run:
+            console.print(f"[cyan]Planned requests:[/cyan] {summary_json.get('planned_requests', 'n/a')}")
+        else:
+            _show_probe_preview(summary_json)
+            _show_matrix_preview(summary_json)
 
 
 @app.command(help="Analyze a probe run directory -> findings.json + findings.md.")
@@ -474,6 +528,8 @@ def analyze(
         help="Do not show a summary of findings.",
     ),
 ):
+    from .diffing import analyze_run_dir
+
     if not run_dir.exists() or not run_dir.is_dir():
         console.print(f"[red]Error: run directory not found: {run_dir}[/red]")
         raise typer.Exit(code=2)
@@ -487,12 +543,14 @@ def analyze(
         f"[green]Wrote findings.[/green]\nJSON -> {findings_json_path}\nMarkdown -> {findings_md_path}"
     )
 
-    if not no_preview:
+    findings_path = Path(findings_json_path)
+    if not no_preview and findings_path.is_file():
         try:
-            findings_json = _read_json(Path(findings_json_path))
-            _show_findings_preview(findings_json)
-        except Exception:
-            pass
+            findings_json = _read_json(findings_path)
+        except (OSError, ValueError) as e:
+            console.print(f"[yellow]Could not read {findings_path} for preview:[/yellow] {e}")
+            return
+        _show_findings_preview(findings_json)
 
 
 @app.command(help="Render a standalone HTML report from a probe run directory.")
@@ -508,6 +566,8 @@ def report(
         help="Path to write HTML report (default: {run_dir}/report.html).",
     ),
 ):
+    from .report import render_report
+
     if not run_dir.exists() or not run_dir.is_dir():
         console.print(f"[red]Error: run directory not found: {run_dir}[/red]")
         raise typer.Exit(code=2)
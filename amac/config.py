@@ -1,29 +1,39 @@
+import hashlib
 import os
 import re
-from fnmatch import fnmatch
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List
-from urllib.parse import urlparse
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import SplitResult, urlsplit
 
 
-try:  # Prefer PyYAML but fall back to minimal parser
+try:  # Prefer PyYAML (with the libyaml C loader when built) but fall back to minimal parser
     import yaml  # type: ignore
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ModuleNotFoundError:  # pragma: no cover - fallback for environments without PyYAML
     from . import _yaml as yaml
+    _YAML_LOADER = None
 
 try:  # Optional pydantic for rich validation
     from pydantic import ValidationError  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover - fallback when pydantic missing
     ValidationError = Exception  # type: ignore
 
+from . import __version__
+from ._json import dumps, loads
 from .models import (
     AuthConfig,
     AuthScheme,
     EvidencePolicy,
+    HostPatternSets,
     PathPolicy,
+    PathRules,
     RequestPolicy,
     ScopeConfig,
     Timeouts,
+    _host_in,
+    _host_pattern_sets,
 )
 
 # -----------------------------
@@ -31,14 +41,109 @@ from .models import (
 # -----------------------------
 
 def _read_yaml(path: str | os.PathLike) -> dict:
+    return _read_yaml_bytes(path)[0]
+
+
+def _read_yaml_bytes(path: str | os.PathLike) -> Tuple[dict, bytes]:
+    """Parse a YAML mapping and also return the raw file bytes it came from."""
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"YAML file not found: {p}")
-    with p.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    blob = p.read_bytes()
+    text = blob.decode("utf-8")
+    if _YAML_LOADER is not None:
+        data = yaml.load(text, Loader=_YAML_LOADER) or {}
+    else:  # pragma: no cover - minimal parser
+        data = yaml.safe_load(text) or {}
     if not isinstance(data, dict):
         raise ValueError(f"YAML root must be a mapping/object: {p}")
-    return data
+    return data, blob
+
+
+# -----------------------------
+# Validated-config cache (scope.yml)
+# -----------------------------
+# Opt-in: only used when AMAC_CACHE_DIR is set. A scope file that validated
+# once is stored as its validated model_dump(), keyed by a hash of the YAML
+# bytes, the AMAC version and a fingerprint of the model code and schema, so
+# editing a validator or normaliser invalidates every entry. Later runs rebuild
+# the models with model_construct() instead of re-running validation.
+# auth.yml is deliberately not cached: it holds credentials.
+
+def _validated_cache_dir() -> Path | None:
+    base = os.environ.get("AMAC_CACHE_DIR")
+    return Path(base) / "validated" if base else None
+
+
+@lru_cache(maxsize=None)
+def _model_fingerprint(model_cls: Any) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(sys.modules[model_cls.__module__].__file__).read_bytes())
+    h.update(dumps(model_cls.model_json_schema()))
+    return h.digest()
+
+
+def _config_digest(model_cls: Any, blob: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{model_cls.__name__}\0{__version__}\0".encode())
+    h.update(_model_fingerprint(model_cls))
+    h.update(blob)
+    return h.hexdigest()
+
+
+def _is_model(ann: Any) -> bool:
+    return isinstance(ann, type) and hasattr(ann, "model_construct")
+
+
+def _mentions_model(ann: Any) -> bool:
+    return _is_model(ann) or any(_mentions_model(a) for a in getattr(ann, "__args__", ()))
+
+
+def _construct_trusted(model_cls: Any, data: Dict[str, Any]) -> Any:
+    """
+    Rebuild a pydantic model from its own model_dump() without validation.
+    Bare model and List[model] fields are rebuilt recursively; any other
+    annotation that nests a model (Optional, Dict, unions...) falls back to
+    model_validate so it never comes back as a raw dict.
+    """
+    fields: Dict[str, Any] = {}
+    for name, info in model_cls.model_fields.items():
+        if name not in data:
+            continue
+        val = data[name]
+        ann = info.annotation
+        args = getattr(ann, "__args__", ())
+        if _is_model(ann) and isinstance(val, dict):
+            val = _construct_trusted(ann, val)
+        elif isinstance(val, list) and len(args) == 1 and _is_model(args[0]):
+            val = [_construct_trusted(args[0], v) if isinstance(v, dict) else v for v in val]
+        elif _mentions_model(ann):
+            return model_cls.model_validate(data)
+        fields[name] = val
+    return model_cls.model_construct(**fields)
+
+
+def _load_validated(model_cls: Any, cache_dir: Path, digest: str) -> Any | None:
+    try:
+        entry = loads((cache_dir / f"{digest}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+    # entries carry their own key; anything else (truncated, renamed, hand-written) is ignored
+    if not isinstance(entry, dict) or entry.get("digest") != digest:
+        return None
+    data = entry.get("config")
+    if not isinstance(data, dict) or data.keys() != model_cls.model_fields.keys():
+        return None
+    return _construct_trusted(model_cls, data)
+
+
+def _store_validated(cfg: Any, cache_dir: Path, digest: str) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {"digest": digest, "config": cfg.model_dump()}
+        (cache_dir / f"{digest}.json").write_bytes(dumps(entry, indent=0))
+    except OSError:
+        pass  # the cache is an optimisation only
 
 
 # -----------------------------
@@ -47,12 +152,18 @@ def _read_yaml(path: str | os.PathLike) -> dict:
 
 def load_scope_config(path: str | os.PathLike) -> ScopeConfig:
     """Load and validate scope.yml into a ScopeConfig."""
-    raw = _read_yaml(path)
+    raw, blob = _read_yaml_bytes(path)
     if hasattr(ScopeConfig, "model_validate"):
-        try:
-            cfg = ScopeConfig.model_validate(raw)
-        except ValidationError as ve:
-            raise ValueError(f"Invalid scope config {path}:\n{ve}") from ve
+        cache_dir = _validated_cache_dir()
+        digest = _config_digest(ScopeConfig, blob) if cache_dir else ""
+        cfg = _load_validated(ScopeConfig, cache_dir, digest) if cache_dir else None
+        if cfg is None:
+            try:
+                cfg = ScopeConfig.model_validate(raw)
+            except ValidationError as ve:
+                raise ValueError(f"Invalid scope config {path}:\n{ve}") from ve
+            if cache_dir:
+                _store_validated(cfg, cache_dir, digest)
     else:  # dataclass fallback
         allowed = [str(s).strip().lower() for s in raw.get("allowed", []) or []]
         base_urls = [str(s).strip() for s in raw.get("base_urls", []) or []]
@@ -111,92 +222,128 @@ def load_auth_config(path: str | os.PathLike) -> AuthConfig:
 # Scope & path matching helpers
 # -----------------------------
 
-def _host_from_url(url: str) -> str:
-    host = urlparse(url).hostname
-    if not host:
-        raise ValueError(f"Invalid absolute URL (no hostname): {url}")
-    return host.lower()
-
+# A URL reduced to what scope checks need: (lowercased host or "", path or "/").
+HostPath = Tuple[str, str]
+UrlLike = str | SplitResult | HostPath
 
-def _path_from_url(url: str) -> str:
-    return urlparse(url).path or "/"
+# scheme "://" prefix as urlsplit() accepts it
+_SCHEME_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*://")
 
 
-def _host_matches(pattern: str, host: str) -> bool:
+@lru_cache(maxsize=8192)
+def _split(url: str) -> HostPath:
     """
-    Wildcard match where pattern may begin with "*.".
-    Examples:
-      pattern="example.com" matches "example.com" only.
-      pattern="*.example.com" matches "a.example.com", "b.c.example.com" but NOT "example.com".
+    Fast (host, path) split of an absolute URL string, equivalent to
+    ``urlsplit(url).hostname`` / ``.path`` for the plain ASCII URLs we handle.
+    Anything unusual (non-ASCII, whitespace/control chars, IPv6 literals,
+    no ``scheme://``) is delegated to urlsplit.
     """
-    pattern = pattern.lower()
-    host = host.lower()
+    m = _SCHEME_RE.match(url)
+    if m is None or not url.isascii() or "[" in url or any(c <= " " for c in url):
+        parts = urlsplit(url)
+        return (parts.hostname or "").lower(), parts.path or "/"
+    rest = url[m.end():]
+    end = len(rest)
+    for sep in "/?#":
+        i = rest.find(sep, 0, end)
+        if i != -1:
+            end = i
+    host = rest[:end].rpartition("@")[2].partition(":")[0].lower()
+    path = rest[end:]
+    for sep in "?#":
+        i = path.find(sep)
+        if i != -1:
+            path = path[:i]
+    return host, path or "/"
+
+
+def _host_path(url: UrlLike) -> HostPath:
+    if isinstance(url, str):
+        return _split(url)
+    if isinstance(url, SplitResult):
+        return (url.hostname or "").lower(), url.path or "/"
+    return url
+
+
+def _host_from_url(url: UrlLike) -> str:
+    host = _host_path(url)[0]
+    if not host:
+        raise ValueError(f"Invalid absolute URL (no hostname): {_display_url(url)}")
+    return host
+
 
-    if pattern.startswith("*."):
-        suffix = pattern[1:]  # keep the dot, e.g. ".example.com"
-        return host.endswith(suffix) and host != pattern[2:]  # not the naked domain
-    else:
-        return host == pattern
+def _path_from_url(url: UrlLike) -> str:
+    return _host_path(url)[1]
+
+
+def _display_url(url: UrlLike) -> str:
+    if isinstance(url, str):
+        return url
+    if isinstance(url, SplitResult):
+        return url.geturl()
+    return f"//{url[0]}{url[1]}"
+
+
+@lru_cache(maxsize=256)
+def _pattern_sets_for(patterns: Tuple[str, ...]) -> HostPatternSets:
+    return _host_pattern_sets(patterns)
 
 
 def any_match(patterns: Iterable[str], host: str) -> bool:
-    return any(_host_matches(p, host) for p in patterns)
+    return _host_in(_pattern_sets_for(tuple(patterns)), host.lower())
 
 
-def is_url_in_scope(url: str, scope: ScopeConfig) -> bool:
+def is_url_in_scope(url: UrlLike, scope: ScopeConfig) -> bool:
     """Check if the URL's host is permitted by allowed/denied lists."""
-    host = _host_from_url(url)
-    if scope.denied and any_match(scope.denied, host):
-        return False
-    if scope.allowed:
-        return any_match(scope.allowed, host)
-    # If `allowed` is empty but base_urls were provided, allow hosts from base_urls.
-    base_hosts = {_host_from_url(u) for u in scope.base_urls}
-    return host in base_hosts
+    return scope.matches_host(_host_from_url(url))
 
 
 # -------- per-path allow/deny ------------------------------------------------
 
-def _path_allowed_by_patterns(path: str, allow_patterns: Iterable[str], deny_patterns: Iterable[str]) -> bool:
+def _path_allowed_by_rules(path: str, allow_rules: PathRules | None, deny_rules: PathRules) -> bool:
     """
     Return True if the given URL path passes deny → allow checks.
-    Pattern semantics:
-      - If pattern starts with 're:' treat the remainder as a regular expression (search).
-      - Otherwise use glob-style matching (fnmatch), case-sensitive per URL norm.
+    Rules come from PathPolicy.allow_rules/deny_rules ('re:' patterns are
+    regex-searched, the rest glob-matched; see models._compiled_path_rules).
     """
     # Deny takes precedence
-    for pat in deny_patterns:
-        if _path_pattern_match(path, pat):
+    for rule in deny_rules:
+        if _path_rule_match(path, rule):
             return False
 
-    # If no allow rules, default allow; else require at least one allow match
-    if not list(allow_patterns):
+    # If no allow list, default allow; else require at least one allow match
+    # (an allow list of only invalid regexes compiles to no rules and allows nothing)
+    if allow_rules is None:
         return True
 
-    return any(_path_pattern_match(path, pat) for pat in allow_patterns)
+    return any(_path_rule_match(path, rule) for rule in allow_rules)
 
 
-def _path_pattern_match(path: str, pattern: str) -> bool:
-    if pattern.startswith("re:"):
-        try:
-            return re.search(pattern[3:], path) is not None
-        except re.error:
-            return False
-    # normalize to start with '/' for consistency
+def _path_rule_match(path: str, rule: Tuple[bool, re.Pattern[str]]) -> bool:
+    is_regex, rx = rule
+    if is_regex:
+        return rx.search(path) is not None
+    # normalize to start with '/' for consistency (normcase mirrors fnmatch())
     norm = path if path.startswith("/") else "/" + path
-    pat = pattern if pattern.startswith("/") or pattern.startswith("re:") else "/" + pattern
-    return fnmatch(norm, pat)
+    return rx.match(os.path.normcase(norm)) is not None
 
 
-def is_url_path_allowed(url: str, scope: ScopeConfig) -> bool:
+def is_url_path_allowed(url: UrlLike, scope: ScopeConfig) -> bool:
     path = _path_from_url(url)
     pol = scope.path_policy
-    return _path_allowed_by_patterns(path, pol.allow_paths, pol.deny_paths)
+    return _path_allowed_by_rules(path, pol.allow_rules, pol.deny_rules)
 
 
-def assert_urls_in_scope(urls: Iterable[str], scope: ScopeConfig) -> None:
-    """Raise if any URL falls outside of host scope or path policy."""
-    out_of_scope = [u for u in urls if not is_url_in_scope(u, scope)]
+def assert_urls_in_scope(urls: Iterable[UrlLike], scope: ScopeConfig) -> None:
+    """
+    Raise if any URL falls outside of host scope or path policy.
+    Accepts URL strings or pre-split URLs (e.g. ``Endpoint.url_parts``); each is split once.
+    """
+    parts = [(u, _host_path(u)) for u in urls]
+    for u, (host, _) in parts:
+        if not host:
+            raise ValueError(f"Invalid absolute URL (no hostname): {_display_url(u)}")
+    out_of_scope = [_display_url(u) for u, hp in parts if not is_url_in_scope(hp, scope)]
     if out_of_scope:
         joined = "\n  - ".join(out_of_scope[:20])
         more = "" if len(out_of_scope) <= 20 else f"\n  (+{len(out_of_scope)-20} more)"
@@ -204,7 +351,7 @@ def assert_urls_in_scope(urls: Iterable[str], scope: ScopeConfig) -> None:
             "Some endpoints are outside of HOST scope. Update scope.yml (allowed/denied/base_urls).\n  - " + joined + more
         )
 
-    path_blocked = [u for u in urls if not is_url_path_allowed(u, scope)]
+    path_blocked = [_display_url(u) for u, hp in parts if not is_url_path_allowed(hp, scope)]
     if path_blocked:
         joined = "\n  - ".join(path_blocked[:20])
         more = "" if len(path_blocked) <= 20 else f"\n  (+{len(path_blocked)-20} more)"
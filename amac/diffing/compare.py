@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -11,18 +11,49 @@ try:  # Try orjson for speed; fall back to stdlib json
 except ModuleNotFoundError:  # pragma: no cover - environments without orjson
     orjson = None
 
+try:  # Optional msgspec: C-level Finding structs and encoding
+    import msgspec  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - dataclass fallback
+    msgspec = None
 
-@dataclass
-class Finding:
-    type: str
-    severity: str
-    method: str
-    url: str
-    requires_auth: Optional[bool]
-    noauth_status: Optional[int]
-    auth_status: Optional[int]
-    delta_size: Optional[int]
-    notes: str
+
+if msgspec is not None:
+
+    class Finding(msgspec.Struct):
+        type: str
+        severity: str
+        method: str
+        url: str
+        requires_auth: Optional[bool]
+        noauth_status: Optional[int]
+        auth_status: Optional[int]
+        delta_size: Optional[int]
+        notes: str
+
+    _finding_dict = msgspec.structs.asdict
+
+else:
+
+    @dataclass
+    class Finding:  # type: ignore[no-redef]
+        type: str
+        severity: str
+        method: str
+        url: str
+        requires_auth: Optional[bool]
+        noauth_status: Optional[int]
+        auth_status: Optional[int]
+        delta_size: Optional[int]
+        notes: str
+
+    _finding_dict = asdict
+
+
+# Status classes used by _classify_row
+_2XX3XX = frozenset({200, 201, 202, 203, 204, 206, 301, 302, 303, 307, 308})
+_OK = frozenset({200, 206})
+_AUTH_FAIL = frozenset({401, 403})
+_PRIVATE_HINTS = ("/me", "/admin", "/profile", "/private")
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
@@ -33,10 +64,19 @@ def _load_json(path: Path) -> Dict[str, Any]:
 
 
 def _dump_json(obj: Any, path: Path) -> None:
-    if orjson:
+    # msgspec/orjson serialize Finding natively; stdlib json needs a hook.
+    if msgspec is not None:
+        path.write_bytes(msgspec.json.format(msgspec.json.encode(obj), indent=2))
+    elif orjson:
         path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
     else:
-        path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+        path.write_text(json.dumps(obj, indent=2, default=_json_default), encoding="utf-8")
+
+
+def _json_default(obj: Any) -> Any:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def _pct_diff(a: int, b: int) -> float:
@@ -85,13 +125,13 @@ def _classify_row(r: Dict[str, Any]) -> List[Finding]:
 
     # 1) If OpenAPI declares auth required:
     if requires_auth is True:
-        if no_s in (200, 201, 202, 203, 204, 206, 301, 302, 303, 307, 308):
+        if no_s in _2XX3XX:
             add(
                 "UNEXPECTED_2XX_OR_3XX_UNAUTH",
                 "high",
                 "Spec declares auth required but unauthenticated request did not return 401/403.",
             )
-        elif no_s not in (401, 403):
+        elif no_s not in _AUTH_FAIL:
             add(
                 "UNEXPECTED_STATUS_UNAUTH",
                 "medium",
@@ -99,7 +139,7 @@ def _classify_row(r: Dict[str, Any]) -> List[Finding]:
             )
 
         # Similar sized bodies between auth and no-auth could indicate leakage
-        if isinstance(au_s, int) and au_s in (200, 206) and no_s in (200, 206):
+        if isinstance(au_s, int) and au_s in _OK and no_s in _OK:
             # treat within 10% size as suspicious similarity
             if _pct_diff(no_sz, au_sz) <= 0.10:
                 add(
@@ -111,7 +151,7 @@ def _classify_row(r: Dict[str, Any]) -> List[Finding]:
     # 2) If auth not declared (unknown), still flag obvious smells
     if requires_auth in (None, False):
         # If unauthenticated returns 200 but authenticated returns 401/403: odd (token breaks?)
-        if isinstance(au_s, int) and au_s in (401, 403) and no_s in (200, 206):
+        if isinstance(au_s, int) and au_s in _AUTH_FAIL and no_s in _OK:
             add(
                 "AUTH_REGRESSION_WITH_TOKEN",
                 "low",
@@ -119,10 +159,9 @@ def _classify_row(r: Dict[str, Any]) -> List[Finding]:
             )
 
         # Similarity between auth/no-auth for endpoints likely private (URL hints)
-        if isinstance(au_s, int) and au_s in (200, 206) and no_s in (200, 206):
-            if _pct_diff(no_sz, au_sz) <= 0.05 and any(
-                key in url.lower() for key in ("/me", "/admin", "/profile", "/private")
-            ):
+        if isinstance(au_s, int) and au_s in _OK and no_s in _OK:
+            url_lower = url.lower()
+            if _pct_diff(no_sz, au_sz) <= 0.05 and any(h in url_lower for h in _PRIVATE_HINTS):
                 add(
                     "SUSPECT_PRIVATE_ENDPOINT_OPEN",
                     "medium",
@@ -137,6 +176,13 @@ def analyze_summary(summary_json: Dict[str, Any]) -> Dict[str, Any]:
     """
     Produce a findings object from a probe run summary.json.
     """
+    result = _analyze(summary_json)
+    result["findings"] = [_finding_dict(f) for f in result["findings"]]
+    return result
+
+
+def _analyze(summary_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Like analyze_summary, but ``findings`` holds the Finding dataclasses themselves."""
     rows: List[Dict[str, Any]] = summary_json.get("rows", [])
     all_findings: List[Finding] = []
     for r in rows:
@@ -158,7 +204,7 @@ def analyze_summary(summary_json: Dict[str, Any]) -> Dict[str, Any]:
             "by_type": type_counts,
             "by_severity": sev_counts,
         },
-        "findings": [asdict(f) for f in all_findings],
+        "findings": all_findings,
     }
 
 
@@ -173,7 +219,7 @@ def analyze_run_dir(run_dir: Path) -> Tuple[Path, Path]:
         raise FileNotFoundError(f"summary.json not found under: {run_dir}")
 
     summary = _load_json(summary_path)
-    findings = analyze_summary(summary)
+    findings = _analyze(summary)
 
     # Write JSON
     findings_json = run_dir / "findings.json"
@@ -191,11 +237,11 @@ def analyze_run_dir(run_dir: Path) -> Tuple[Path, Path]:
         md_lines.append("## Items\n")
         for i, f in enumerate(findings["findings"], 1):
             md_lines.append(
-                f"{i}. **{f['severity'].upper()}** — {f['type']}  \n"
-                f"   `{f['method']} {f['url']}`  \n"
-                f"   no-auth: {f.get('noauth_status')} → auth: {f.get('auth_status')}  \n"
-                f"   Δsize: {f.get('delta_size')}  \n"
-                f"   _{f.get('notes','')}_\n"
+                f"{i}. **{f.severity.upper()}** — {f.type}  \n"
+                f"   `{f.method} {f.url}`  \n"
+                f"   no-auth: {f.noauth_status} → auth: {f.auth_status}  \n"
+                f"   Δsize: {f.delta_size}  \n"
+                f"   _{f.notes}_\n"
             )
     else:
         md_lines.append("_No findings under current heuristics._\n")
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+from .refs import _deref
+
+# Keywords combined across allOf branches; everything else is first-declared-wins
+_TAKE_MAX = ("minLength", "minimum", "minItems", "minProperties")
+_TAKE_MIN = ("maxLength", "maximum", "maxItems", "maxProperties")
+_NUMERIC = ("integer", "number")
+# Keywords that never affect a sample; a singleton allOf carrying only these is its child
+_ANNOTATIONS = frozenset({"description", "title", "deprecated", "readOnly", "writeOnly",
+                          "externalDocs", "xml"})
+
+
+def merge_allof(schema: Dict[str, Any], doc: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Flatten `allOf` into a single schema: the outer schema's own keywords plus
+    every branch ($refs resolved, nested allOf flattened).
+      - properties are merged; a property declared by several branches becomes
+        {"allOf": [...]} of its declarations (flattened lazily when sampled)
+      - required is the ordered union, enum the intersection
+      - min* keywords take the largest bound, max* the smallest
+      - type: integer beats number, otherwise the first declared type wins
+      - additionalProperties: False if any branch forbids them
+    Results are memoized per loaded document (see refs._Spec).
+    """
+    cache = getattr(doc, "_merged_cache", None)
+    if cache is not None:
+        hit = cache.get(id(schema))
+        if hit is not None:
+            return hit[1]
+    merged = _merge(schema, doc, set())
+    if cache is not None:
+        # keep the schema alive alongside the result so its id() cannot be reused
+        cache[id(schema)] = (schema, merged)
+    return merged
+
+
+def _merge(schema: Dict[str, Any], doc: Dict[str, Any] | None, active: set[int]) -> Dict[str, Any]:
+    branches = schema.get("allOf") or []
+    if len(branches) == 1 and all(k == "allOf" or k in _ANNOTATIONS or k.startswith("x-") for k in schema):
+        # {"allOf": [X], "description": ...} is just X: reuse the child itself so
+        # every wrapper around a shared component hits that component's caches
+        child = branches[0]
+        if isinstance(child, dict) and "$ref" in child and doc:
+            child = _deref(child, doc)
+        if isinstance(child, dict) and id(child) not in active:
+            if not isinstance(child.get("allOf"), list):
+                return child
+            active.add(id(schema))
+            try:
+                return _merge(child, doc, active)
+            finally:
+                active.discard(id(schema))
+
+    out: Dict[str, Any] = {}
+    active.add(id(schema))
+    _absorb(out, {k: v for k, v in schema.items() if k != "allOf"})
+    for branch in branches:
+        if isinstance(branch, dict) and "$ref" in branch and doc:
+            branch = _deref(branch, doc)
+        if not isinstance(branch, dict) or id(branch) in active:
+            continue  # unresolvable or cyclic branch
+        if isinstance(branch.get("allOf"), list):
+            branch = _merge(branch, doc, active)
+        _absorb(out, branch)
+    active.discard(id(schema))
+    if "properties" in out and "type" not in out:
+        out["type"] = "object"
+    return out
+
+
+def _absorb(out: Dict[str, Any], branch: Dict[str, Any]) -> None:
+    for key, value in branch.items():
+        if key == "properties" and isinstance(value, dict):
+            props = out.setdefault("properties", {})
+            for name, prop in value.items():
+                prev = props.get(name)
+                props[name] = prop if prev is None or prev is prop else {"allOf": [prev, prop]}
+        elif key == "required" and isinstance(value, list):
+            required: List[Any] = out.setdefault("required", [])
+            required.extend(r for r in value if r not in required)
+        elif key == "enum" and isinstance(value, list) and isinstance(out.get("enum"), list):
+            out["enum"] = [e for e in out["enum"] if e in value]
+        elif key in _TAKE_MAX and key in out:
+            out[key] = _bound(out[key], value, max)
+        elif key in _TAKE_MIN and key in out:
+            out[key] = _bound(out[key], value, min)
+        elif key == "type" and key in out:
+            if out["type"] in _NUMERIC and value in _NUMERIC:
+                out["type"] = "integer" if "integer" in (out["type"], value) else "number"
+        elif key == "additionalProperties" and key in out:
+            if value is False:
+                out[key] = False
+        else:
+            out.setdefault(key, value)
+
+
+def _bound(a: Any, b: Any, pick: Callable[[Any, Any], Any]) -> Any:
+    try:
+        return pick(a, b)
+    except TypeError:  # non-numeric bound; keep the first declaration
+        return a
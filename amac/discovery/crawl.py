@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import re
+from collections import defaultdict
 from dataclasses import dataclass
 from html.parser import HTMLParser
-from typing import Iterable, List, Set
-from urllib.parse import urljoin, urlparse
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 
 import httpx
 
 from ..config import is_url_in_scope
 from ..models import ScopeConfig
 
+try:  # Optional C-backed HTML parser (pip install "amac[fast]")
+    from selectolax.lexbor import LexborHTMLParser as _FastHTMLParser  # type: ignore
+except ImportError:  # pragma: no cover - stdlib HTMLParser fallback
+    _FastHTMLParser = None
+
+_log = logging.getLogger(__name__)
+
 # --- tiny HTML <a href> extractor (no external deps) ------------------------
 
 class _HrefParser(HTMLParser):
@@ -27,6 +36,29 @@ class _HrefParser(HTMLParser):
                 self.hrefs.append(v)
 
 
+def _decode_html(data: bytes, encoding: str | None) -> str:
+    try:
+        return data.decode(encoding or "utf-8", "ignore")
+    except LookupError:
+        return data.decode("utf-8", "ignore")
+
+
+def _extract_hrefs(data: bytes, encoding: str | None = None) -> List[str]:
+    """All ``<a href>`` values in document order; selectolax (lexbor) parses when available."""
+    if _FastHTMLParser is not None:
+        try:
+            nodes = _FastHTMLParser(_decode_html(data, encoding)).css("a[href]")
+        except Exception:
+            return []
+        return [h for n in nodes if isinstance(h := n.attributes.get("href"), str)]
+    p = _HrefParser()
+    try:
+        p.feed(_decode_html(data, encoding))
+    except Exception:
+        pass
+    return p.hrefs
+
+
 # --- public API -------------------------------------------------------------
 
 @dataclass
@@ -42,6 +74,8 @@ async def lightweight_discover(
     *,
     budget: int = 200,
     timeout: float = 10.0,
+    max_concurrency: int = 32,
+    per_host: int = 8,
 ) -> CrawlResult:
     """
     Super-light discovery for read-only endpoints:
@@ -50,92 +84,132 @@ async def lightweight_discover(
       - expand relative links to absolute
       - keep only HTTP/HTTPS URLs within scope
     Returns a deduped list of absolute URLs (method unspecified; intended for GET/HEAD).
+    At most ``max_concurrency`` requests are in flight overall and ``per_host`` per host.
     """
     seeds: List[str] = []
     for b in base_urls:
         u = b.rstrip("/")
         seeds.extend([u + "/", u + "/robots.txt", u + "/sitemap.xml"])
 
-    seen: Set[str] = set()
+    seen: Set[int] = set()  # hash(_canonical(url)) of every URL queued or emitted
     out: Set[str] = set()
     fetched = 0
 
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, http2=True) as client:
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    host_slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+    started = 0
+
+    async with httpx.AsyncClient(
+        timeout=timeout, follow_redirects=True, http2=True, limits=limits
+    ) as client:
         q: asyncio.Queue[str] = asyncio.Queue()
         for s in seeds:
             await q.put(s)
-            seen.add(s)
-
-        async def worker():
-            nonlocal fetched
-            while fetched < budget:
-                try:
-                    url = await asyncio.wait_for(q.get(), timeout=0.2)
-                except asyncio.TimeoutError:
-                    return
-                try:
+            seen.add(hash(_canonical(s)))
+
+        async def visit(url: str) -> None:
+            nonlocal fetched, started
+            if started >= budget:
+                return  # budget spent: drain the queue without fetching
+            started += 1
+            try:
+                async with host_slots[urlparse(url).netloc.lower()]:
                     r = await client.get(url, headers={"User-Agent": "AMAC-Crawler/0.1"})
-                    fetched += 1
-                except Exception:
-                    continue
-
-                ctype = r.headers.get("content-type", "")
-                text = ""
+                fetched += 1
+            except Exception:
+                return
+
+            ctype = r.headers.get("content-type", "")
+            if "html" not in ctype and not url.endswith(_LINK_SOURCES):
+                return  # nothing to extract from images, JSON, etc.
+            body = r.content
+
+            # Collect links from HTML
+            if "html" in ctype and body:
+                for href in await _parse_body(_extract_hrefs, body, r.charset_encoding):
+                    absu = _normalize_href(url, href)
+                    if not absu:
+                        continue
+                    absu = _canonical(absu)
+                    if not _same_host(url, absu):
+                        continue
+                    if not is_url_in_scope(absu, scope):
+                        continue
+                    key = hash(absu)
+                    if key not in seen:
+                        seen.add(key)
+                        out.add(absu)
+                        # limited breadth-first
+                        if started + q.qsize() < budget and absu not in _resource_blacklist:
+                            q.put_nowait(absu)
+
+            # Parse robots for sitemaps
+            if url.endswith("/robots.txt") and body:
+                for sm in await _parse_body(_sitemaps_from_robots, body):
+                    key = hash(_canonical(sm))
+                    if key not in seen:
+                        seen.add(key)
+                        q.put_nowait(sm)
+
+            # Parse sitemap.xml URLs
+            if url.endswith("/sitemap.xml") and body:
+                for loc in await _parse_body(_urls_from_sitemap_xml, body):
+                    # only same-host as the sitemap origin and in scope
+                    if _same_host(url, loc) and is_url_in_scope(loc, scope):
+                        out.add(loc)
+
+        async def worker() -> None:
+            while True:
+                url = await q.get()
                 try:
-                    text = r.text
-                except Exception:
-                    text = ""
-
-                # Collect links from HTML
-                if "html" in ctype and text:
-                    p = _HrefParser()
-                    try:
-                        p.feed(text)
-                    except Exception:
-                        pass
-                    for href in p.hrefs:
-                        absu = _normalize_href(url, href)
-                        if not absu:
-                            continue
-                        if not _same_host(url, absu):
-                            continue
-                        if not is_url_in_scope(absu, scope):
-                            continue
-                        if absu not in seen:
-                            seen.add(absu)
-                            out.add(absu)
-                            # limited breadth-first
-                            if fetched + q.qsize() < budget and absu not in _resource_blacklist:
-                                await q.put(absu)
-
-                # Parse robots for sitemaps
-                if url.endswith("/robots.txt") and text:
-                    for sm in _sitemaps_from_robots(text):
-                        if sm not in seen:
-                            seen.add(sm)
-                            await q.put(sm)
-
-                # Parse sitemap.xml URLs
-                if url.endswith("/sitemap.xml") and text:
-                    for loc in _urls_from_sitemap_xml(text):
-                        # only same-host as the sitemap origin and in scope
-                        if _same_host(url, loc) and is_url_in_scope(loc, scope):
-                            out.add(loc)
-
-                q.task_done()
-
-        # spin a few workers
-        workers = [asyncio.create_task(worker()) for _ in range(4)]
+                    await visit(url)
+                except Exception as exc:
+                    # One bad URL (e.g. a malformed sitemap <loc>) must not kill the worker
+                    _log.warning("Crawl of %s failed: %s", url, exc)
+                finally:
+                    q.task_done()
+
+        # Workers run until the queue drains (nothing queued or in flight).
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))]
+        await q.join()
+        for t in workers:
+            t.cancel()
         await asyncio.gather(*workers, return_exceptions=True)
 
-    # Keep only http/https and in-scope
-    urls = sorted(u for u in out if u.startswith(("http://", "https://")) and is_url_in_scope(u, scope))
+    # Keep only http/https (everything in `out` already passed is_url_in_scope)
+    urls = sorted(u for u in out if u.startswith(("http://", "https://")))
     return CrawlResult(seeds=seeds, pages_fetched=fetched, urls=urls)
 
 
 # --- helpers ----------------------------------------------------------------
 
+# Bodies above this size are parsed in a worker thread so a large page does
+# not stall every other in-flight request on the event loop.
+_OFFLOAD_BYTES = 64 * 1024
+
+async def _parse_body(parse: Callable[..., Iterable[str]], body: bytes, *args: Any) -> List[str]:
+    if len(body) > _OFFLOAD_BYTES:
+        return await asyncio.to_thread(lambda: list(parse(body, *args)))
+    return list(parse(body, *args))
+
+
 _resource_blacklist = {"/favicon.ico", "/robots.txt", "/sitemap.xml"}
+_LINK_SOURCES = ("/robots.txt", "/sitemap.xml")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+def _canonical(url: str) -> str:
+    """Dedup key form of a URL: lowercase scheme/host, no default port, no fragment."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    hostport = hostport.lower()
+    host, sep, port = hostport.rpartition(":")
+    if sep and port == _DEFAULT_PORTS.get(scheme):
+        hostport = host
+    return urlunsplit((scheme, userinfo + at + hostport, parts.path, parts.query, ""))
 
 def _same_host(src: str, dst: str) -> bool:
     return (urlparse(src).hostname or "").lower() == (urlparse(dst).hostname or "").lower()
@@ -148,11 +222,16 @@ def _normalize_href(base_url: str, href: str) -> str | None:
     except Exception:
         return None
 
-_SITEMAP_RE = re.compile(r"(?mi)^\s*sitemap:\s*(\S+)\s*$")
+# robots.txt / sitemap.xml are scanned as raw bytes: no full-body decode,
+# only the matched URLs are decoded.
+_SITEMAP_RE = re.compile(rb"(?mi)^\s*sitemap:\s*(\S+)\s*$")
+_LOC_RE = re.compile(rb"<loc>\s*([^<\s]+)\s*</loc>", re.I)
 
-def _sitemaps_from_robots(text: str) -> List[str]:
-    return [m.group(1).strip() for m in _SITEMAP_RE.finditer(text or "")]
+def _sitemaps_from_robots(data: bytes) -> Iterator[str]:
+    for m in _SITEMAP_RE.finditer(data or b""):
+        yield m.group(1).strip().decode("utf-8", "replace")
 
-def _urls_from_sitemap_xml(text: str) -> List[str]:
+def _urls_from_sitemap_xml(data: bytes) -> Iterator[str]:
     # very small parser: find <loc>...</loc>
-    return re.findall(r"<loc>\s*([^<\s]+)\s*</loc>", text or "", flags=re.I)
+    for m in _LOC_RE.finditer(data or b""):
+        yield m.group(1).decode("utf-8", "replace")
@@ -1,18 +1,45 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
+import re
+import sys
+import urllib.request
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
-
-try:  # Use PyYAML if available, else fall back to internal minimal parser
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import quote, urlencode, urljoin
+
+try:  # Use PyYAML (C loader when built) if available, else fall back to internal minimal parser
     import yaml  # type: ignore
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ModuleNotFoundError:  # pragma: no cover - fallback
     from .. import _yaml as yaml
+    _YAML_LOADER = None
+
+try:  # Optional: stream `paths` out of very large JSON specs
+    import ijson  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - optional
+    ijson = None
 
+from .._json import loads
 from ..config import choose_base_urls, is_url_in_scope, is_url_path_allowed
 from ..models import Endpoint, EndpointSet, ScopeConfig
-from .sampler import fill_server_variables, sample_param_value, sample_schema_value
+from .refs import _deref, _Spec
+from .sampler import fill_server_variables, sample_param_value, sample_validated
+
+_log = logging.getLogger(__name__)
 
 # -----------------------------
 # Loaders
@@ -21,53 +48,76 @@ from .sampler import fill_server_variables, sample_param_value, sample_schema_va
 async def _load_spec(src: str) -> Dict[str, Any]:
     """Load an OpenAPI doc from a local path or HTTP(S) URL (JSON or YAML)."""
     if src.lower().startswith(("http://", "https://")):
-        try:  # Import httpx only when needed
-            import httpx  # type: ignore
-        except ModuleNotFoundError as e:  # pragma: no cover
-            raise RuntimeError("httpx is required to fetch remote OpenAPI documents") from e
-        async with httpx.AsyncClient(timeout=20) as client:
-            r = await client.get(src)
-            r.raise_for_status()
-            text = r.text
+        data = await asyncio.to_thread(_fetch_bytes, src)
     else:
-        text = Path(src).read_text(encoding="utf-8")
+        data = await asyncio.to_thread(Path(src).read_bytes)
+    # multi-MB specs take a while to parse; keep that off the event loop too
+    return await asyncio.to_thread(_parse_spec, data)
 
-    # try JSON first, then YAML
+
+def _parse_spec(data: bytes) -> Dict[str, Any]:
+    # try JSON first (orjson parses the bytes directly), then YAML
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        data = yaml.safe_load(text)
-        if not isinstance(data, dict):
-            raise ValueError("OpenAPI file must be a JSON/YAML object")
-        return data
+        doc = loads(data)
+    except ValueError:
+        if _YAML_LOADER is not None:
+            doc = yaml.load(data, Loader=_YAML_LOADER)
+        else:  # pragma: no cover - minimal parser wants text
+            doc = yaml.safe_load(data.decode("utf-8"))
+    if not isinstance(doc, dict):
+        raise ValueError("OpenAPI file must be a JSON/YAML object")
+    return _Spec(doc)
 
 
-# -----------------------------
-# Ref resolution (very small)
-# -----------------------------
+# Local JSON specs at least this large are mapped path by path when ijson is available
+_STREAM_MIN_BYTES = 8 * 1024 * 1024
+
 
-def _resolve_local_ref(doc: Dict[str, Any], ref: str) -> Any:
+def _open_streaming(src: str) -> Optional[Tuple[Dict[str, Any], Iterator[Tuple[str, Any]]]]:
     """
-    Resolve a local JSON pointer like "#/components/schemas/User".
-    External refs (URLs, files) are not supported in MVP.
+    For a large local JSON spec, return (document without `paths`, iterator of
+    (raw_path, path_item)) so only one path item is materialized at a time.
+    Returns None when streaming does not apply (no ijson, remote, YAML, small file).
+    Refs that point into #/paths/... do not resolve in streaming mode.
     """
-    if not ref.startswith("#/"):
-        # naive: skip external
-        return {"$ref": ref}
-    parts = ref[2:].split("/")
-    cur: Any = doc
-    for p in parts:
-        if isinstance(cur, dict) and p in cur:
-            cur = cur[p]
-        else:
-            return {"$ref": ref}
-    return cur
+    if ijson is None or src.lower().startswith(("http://", "https://")):
+        return None
+    p = Path(src)
+    if p.suffix.lower() != ".json" or p.stat().st_size < _STREAM_MIN_BYTES:
+        return None
 
+    # Pass 1: build every top-level member except `paths` (components may follow it)
+    builder = ijson.ObjectBuilder()
+    try:
+        with p.open("rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == "paths" or prefix.startswith("paths."):
+                    continue
+                if prefix == "" and event == "map_key" and value == "paths":
+                    continue
+                builder.event(event, value)
+    except ijson.JSONError:
+        return None  # not JSON after all; let the full loader try YAML
+    if not isinstance(builder.value, dict):
+        return None
 
-def _deref(obj: Any, doc: Dict[str, Any]) -> Any:
-    if isinstance(obj, dict) and "$ref" in obj:
-        return _deref(_resolve_local_ref(doc, obj["$ref"]), doc)
-    return obj
+    # Pass 2 (lazy): the path items themselves
+    def paths() -> Iterator[Tuple[str, Any]]:
+        with p.open("rb") as f:
+            yield from ijson.kvitems(f, "paths", use_float=True)
+
+    return _Spec(builder.value), paths()
+
+
+def _fetch_bytes(url: str, timeout: float = 20.0) -> bytes:
+    """
+    One-shot GET of a remote spec. A single request does not justify building an
+    httpx client (TLS context + pool), so use urllib in a worker thread.
+    HTTP errors raise urllib.error.HTTPError.
+    """
+    req = urllib.request.Request(url, headers={"User-Agent": "AMAC/0.1"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
 
 
 # -----------------------------
@@ -107,20 +157,15 @@ def _operation_requires_auth(doc: Dict[str, Any], path_item: Dict[str, Any], op_
 # -----------------------------
 
 def _server_urls(doc: Dict[str, Any]) -> List[str]:
-    urls: List[str] = []
-    servers = doc.get("servers") or []
-    for s in servers:
-        if not isinstance(s, dict):
-            continue
-        u = fill_server_variables(s)
-        if u:
-            urls.append(u.rstrip("/"))
-    return urls
+    return _expand_servers(doc.get("servers") or [])
 
 
 def _path_servers(path_item: Dict[str, Any]) -> List[str]:
+    return _expand_servers(path_item.get("servers") or [])
+
+
+def _expand_servers(servers: List[Any]) -> List[str]:
     urls: List[str] = []
-    servers = path_item.get("servers") or []
     for s in servers:
         if not isinstance(s, dict):
             continue
@@ -130,6 +175,22 @@ def _path_servers(path_item: Dict[str, Any]) -> List[str]:
     return urls
 
 
+def _base_prefixes(base_urls: List[str]) -> List[str]:
+    """Server URLs as join prefixes ending in exactly one "/"."""
+    return [b.rstrip("/") + "/" for b in base_urls]
+
+
+def _join_base(prefix: str, rel_path: str) -> str:
+    """
+    ``urljoin(prefix, rel_path)`` for a prefix ending in "/" and a relative path:
+    plain concatenation, with urljoin only needed to collapse "." / ".." segments.
+    """
+    url = prefix + rel_path
+    if "/./" in url or "/../" in url or url.endswith(("/.", "/..")):
+        return urljoin(prefix, rel_path)
+    return url
+
+
 # -----------------------------
 # Parameter handling
 # -----------------------------
@@ -147,43 +208,77 @@ def _collect_params(doc: Dict[str, Any], path_item: Dict[str, Any], op_obj: Dict
     return params
 
 
-def _apply_path_template(path_template: str, params: List[Dict[str, Any]]) -> str:
+# Sampled value producer for one parameter (sample_param_value pre-bound)
+_Sampler = Callable[[], str]
+
+
+class _ParamPlan(NamedTuple):
     """
-    Replace /users/{id} with a sampled value.
+    The parameters the URL builders need, classified once per operation:
+    required path params by name (first declaration wins) and the
+    required-or-defaulted query params in declaration order.
     """
-    out = path_template
+    path: Dict[str, _Sampler]
+    query: Tuple[Tuple[str, _Sampler], ...]
+
+
+def _plan_params(params: List[Dict[str, Any]]) -> _ParamPlan:
+    path: Dict[str, _Sampler] = {}
+    query: List[Tuple[str, _Sampler]] = []
     for p in params:
-        if p.get("in") == "path" and p.get("required", True):
-            name = p.get("name", "")
-            val = sample_param_value(p)
-            out = out.replace("{" + str(name) + "}", str(val))
-    return out
+        loc = p.get("in")
+        if loc == "path":
+            if p.get("required", True):
+                path.setdefault(str(p.get("name", "")), partial(sample_param_value, p))
+        elif loc == "query":
+            schema = p.get("schema") or {}
+            has_default = isinstance(schema, dict) and "default" in schema
+            if p.get("required", False) or has_default:
+                query.append((str(p.get("name", "q")), partial(sample_param_value, p)))
+    return _ParamPlan(path, tuple(query))
 
 
-def _build_query(params: List[Dict[str, Any]]) -> str:
+_PATH_VAR_RE = re.compile(r"\{([^}]+)\}")
+
+
+def _apply_path_template(path_template: str, path_params: Dict[str, _Sampler]) -> str:
+    """
+    Replace /users/{id} with a sampled value.
+    """
+    if "{" not in path_template:
+        return path_template
+    values: Dict[str, str] = {}
+
+    def sub(m: re.Match[str]) -> str:
+        name = m.group(1)
+        if name not in values:
+            sample = path_params.get(name)
+            values[name] = m.group(0) if sample is None else str(sample())
+        return values[name]
+
+    return _PATH_VAR_RE.sub(sub, path_template)
+
+
+def _build_query(query_params: Tuple[Tuple[str, _Sampler], ...]) -> str:
     """Build a query string for required or defaulted query parameters."""
-    items: List[str] = []
-    for p in params:
-        if p.get("in") != "query":
-            continue
-        schema = p.get("schema") or {}
-        has_default = isinstance(schema, dict) and "default" in schema
-        if p.get("required", False) or has_default:
-            name = str(p.get("name", "q"))
-            val = sample_param_value(p)
-            items.append(f"{name}={val}")
-    return ("?" + "&".join(items)) if items else ""
+    if not query_params:
+        return ""
+    items = [(name, sample()) for name, sample in query_params]
+    # ':', '/' and '@' are legal in a query component; keep dates/URLs/emails readable
+    return "?" + urlencode(items, safe=":/@", quote_via=quote)
 
 
-def _sample_request_body(doc: Dict[str, Any], op_obj: Dict[str, Any]) -> tuple[Any, str] | None:
+def _sample_request_body(doc: Dict[str, Any], op_obj: Dict[str, Any]) -> tuple[Any, str, Dict[str, Any]] | None:
     """
     Return a sample body for required requestBody with content type information.
     Supports multiple content types: JSON, form-urlencoded, multipart, text/plain, etc.
     
     Returns:
-        Tuple of (body_data, content_type) or None if no request body
+        Tuple of (body_data, content_type, validation_error) or None if no request body
     """
     rb = op_obj.get("requestBody")
+    if rb is None:
+        return None
     rb = _deref(rb, doc) if isinstance(rb, dict) else None
     if not isinstance(rb, dict) or not rb.get("required"):
         return None
@@ -209,16 +304,16 @@ def _sample_request_body(doc: Dict[str, Any], op_obj: Dict[str, Any]) -> tuple[A
             if isinstance(media, dict):
                 schema = _deref(media.get("schema"), doc) if isinstance(media, dict) else None
                 if isinstance(schema, dict):
-                    body_data = sample_schema_value(schema, doc=doc)
-                    return (body_data, preferred_type)
+                    body_data, error = sample_validated(schema, doc)
+                    return (body_data, preferred_type, error)
     
     # Fallback: try any content type
     for content_type, media in content.items():
         if isinstance(media, dict):
             schema = _deref(media.get("schema"), doc) if isinstance(media, dict) else None
             if isinstance(schema, dict):
-                body_data = sample_schema_value(schema, doc=doc)
-                return (body_data, content_type)
+                body_data, error = sample_validated(schema, doc)
+                return (body_data, content_type, error)
     
     return None
 
@@ -227,6 +322,12 @@ def _sample_request_body(doc: Dict[str, Any], op_obj: Dict[str, Any]) -> tuple[A
 # Main mapping
 # -----------------------------
 
+_BODY_METHODS = frozenset({"post", "put", "patch", "delete"})
+_VALID_METHODS = frozenset({"get", "head", "post", "put", "delete", "patch", "options"})
+# One shared string object per verb / template / tag across all endpoints of a spec
+_METHOD_NAMES = {m: sys.intern(m.upper()) for m in _VALID_METHODS}
+
+
 async def load_and_map_openapi(openapi_src: str, scope: ScopeConfig) -> EndpointSet:
     """
     Load OpenAPI → build EndpointSet of URLs for allowed HTTP methods
@@ -237,104 +338,129 @@ async def load_and_map_openapi(openapi_src: str, scope: ScopeConfig) -> Endpoint
       - inherited security (root → path → operation)
       - oneOf/anyOf in param schemas (first branch)
     """
-    doc = await _load_spec(openapi_src)
+    streamed = await asyncio.to_thread(_open_streaming, openapi_src)
+    paths: Iterable[Tuple[str, Any]]
+    if streamed is not None:
+        doc, paths = streamed
+    else:
+        doc = await _load_spec(openapi_src)
+        paths = (doc.get("paths") or {}).items()
 
     # Determine base URLs (servers from spec or scope.base_urls)
     server_urls = _server_urls(doc)
     base_urls = choose_base_urls(scope, server_urls)
 
-    endpoints: List[Endpoint] = []
-
     allowed_methods = {"get", "head"}
     if not scope.request_policy.safe_methods_only:
         allowed_methods.update(m.lower() for m in scope.request_policy.non_safe_methods)
+    methods = _VALID_METHODS.intersection(allowed_methods)
+
+    # Mapping is pure CPU work; run it in a worker so the event loop stays responsive
+    endpoints = await asyncio.to_thread(_map_paths, doc, paths, base_urls, methods, scope)
+    return EndpointSet.make_trusted(endpoints=endpoints)
+
+
+def _map_paths(
+    doc: Dict[str, Any],
+    paths: Iterable[Tuple[str, Any]],
+    base_urls: List[str],
+    methods: FrozenSet[str],
+    scope: ScopeConfig,
+) -> List[Endpoint]:
+    endpoints: List[Endpoint] = []
+    seen: set[tuple[str, str]] = set()
+    default_prefixes = _base_prefixes(base_urls)  # shared by every path without its own servers
+    for raw_path, path_item in paths:
+        if isinstance(path_item, dict):
+            template = sys.intern(str(raw_path))
+            endpoints.extend(
+                _endpoints_for_path(doc, template, path_item, default_prefixes, methods, scope, seen)
+            )
+    return endpoints
+
+
+def _endpoints_for_path(
+    doc: Dict[str, Any],
+    raw_path: str,
+    path_item: Dict[str, Any],
+    default_prefixes: List[str],
+    methods: FrozenSet[str],
+    scope: ScopeConfig,
+    seen: set[tuple[str, str]],
+) -> List[Endpoint]:
+    """Endpoints for one path item; `seen` dedups (method, url) across the whole spec."""
+    endpoints: List[Endpoint] = []
 
-    valid_methods = {"get", "head", "post", "put", "delete", "patch", "options"}
+    # Servers override for this path
+    path_servers = _path_servers(path_item)
+    base_prefixes = _base_prefixes(path_servers) if path_servers else default_prefixes
 
-    paths = doc.get("paths") or {}
-    for raw_path, path_item in paths.items():
-        if not isinstance(path_item, dict):
+    for method, op_obj in path_item.items():
+        if method not in methods or not isinstance(op_obj, dict):
             continue
 
-        # Servers override for this path
-        base_for_path = _path_servers(path_item) or base_urls
+        # Security inherited
+        req_auth = _operation_requires_auth(doc, path_item, op_obj)
+
+        # Params
+        plan = _plan_params(_collect_params(doc, path_item, op_obj))
+        # Build concrete path with substitutions + required query
+        concrete_path = _apply_path_template(raw_path, plan.path)
+        query = _build_query(plan.query)
+
+        # Sample request body if present (only for methods that carry one)
+        body_result = _sample_request_body(doc, op_obj) if method in _BODY_METHODS else None
+        extra = {}
+        if body_result is not None:
+            body_data, content_type, error = body_result
+
+            # Generated bodies are checked against their schema once per schema
+            if error is not None and _log.isEnabledFor(logging.WARNING):
+                # Log warning but continue - validation is best-effort
+                _log.warning("Generated body validation failed for %s %s: %s", method, raw_path, error)
+
+            extra = {
+                "body": body_data,
+                "content_type": content_type,
+            }
+
+        # Operation metadata is the same for every server
+        tags = op_obj.get("tags") or []
+        tags_list = []
+        if isinstance(tags, list):
+            tags_list = [sys.intern(str(t)) for t in tags]
+        op_id = op_obj.get("operationId")
+        op_id_str = str(op_id) if op_id else None
+        method_upper = _METHOD_NAMES[method]
+
+        # Resulting URLs for each server
+        rel_path = concrete_path.lstrip("/")
+        for prefix in base_prefixes:
+            full = _join_base(prefix, rel_path) + query
+
+            # Deduplicate (method,url); a repeat would get the same scope verdict
+            key = (method_upper, full)
+            if key in seen:
+                continue
+            seen.add(key)
 
-        for method, op_obj in path_item.items():
-            if method not in valid_methods or method not in allowed_methods:
+            # Host-level and path-level scope gates
+            if not is_url_in_scope(full, scope):
                 continue
-            if not isinstance(op_obj, dict):
+            if not is_url_path_allowed(full, scope):
                 continue
 
-            # Security inherited
-            req_auth = _operation_requires_auth(doc, path_item, op_obj)
-
-            # Params
-            params = _collect_params(doc, path_item, op_obj)
-            # Build concrete path with substitutions + required query
-            concrete_path = _apply_path_template(str(raw_path), params)
-            query = _build_query(params)
-
-            # Sample request body if present
-            body_result = _sample_request_body(doc, op_obj)
-            extra = {}
-            if body_result is not None:
-                body_data, content_type = body_result
-                
-                # Validate generated body against schema
-                rb = op_obj.get("requestBody")
-                rb = _deref(rb, doc) if isinstance(rb, dict) else None
-                if isinstance(rb, dict):
-                    content = rb.get("content") or {}
-                    media = content.get(content_type) if isinstance(content, dict) else None
-                    if isinstance(media, dict):
-                        schema = _deref(media.get("schema"), doc) if isinstance(media, dict) else None
-                        if isinstance(schema, dict):
-                            from .sampler import validate_generated_body
-                            is_valid, error = validate_generated_body(body_data, schema, doc)
-                            if not is_valid:
-                                # Log warning but continue - validation is best-effort
-                                import logging
-                                logging.warning(f"Generated body validation failed for {method} {raw_path}: {error}")
-                
-                extra = {
-                    "body": body_data,
-                    "content_type": content_type,
-                }
-
-            # Resulting URLs for each server
-            for b in base_for_path:
-                full = urljoin(b.rstrip("/") + "/", concrete_path.lstrip("/")) + query
-
-                # Host-level and path-level scope gates
-                if not is_url_in_scope(full, scope):
-                    continue
-                if not is_url_path_allowed(full, scope):
-                    continue
-
-                # tags + operationId
-                tags = op_obj.get("tags") or []
-                op_id = op_obj.get("operationId")
-
-                endpoints.append(
-                    Endpoint(
-                        method=method.upper(),  # type: ignore[arg-type]
-                        url=full,
-                        requires_auth=req_auth,
-                        template=str(raw_path),
-                        tags=tags if isinstance(tags, list) else [],
-                        operation_id=str(op_id) if op_id else None,
-                        extra=extra,
-                    )
+            endpoints.append(
+                # every field is built above from the parsed spec; skip re-validation
+                Endpoint.make_trusted(
+                    method=method_upper,
+                    url=full,
+                    requires_auth=req_auth,
+                    template=raw_path,
+                    tags=tags_list.copy(),
+                    operation_id=op_id_str,
+                    extra=extra.copy(),
                 )
+            )
 
-    # Deduplicate (method,url)
-    seen = set()
-    uniq: List[Endpoint] = []
-    for ep in endpoints:
-        key = (ep.method, ep.url)
-        if key in seen:
-            continue
-        seen.add(key)
-        uniq.append(ep)
-
-    return EndpointSet(endpoints=uniq)
+    return endpoints
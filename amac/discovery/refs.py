@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# -----------------------------
+# Ref resolution (very small)
+# -----------------------------
+
+class _Spec(dict):
+    """
+    A loaded OpenAPI document plus per-document memo tables.
+    Plain dicts still work everywhere, they just resolve refs uncached.
+    """
+    __slots__ = ("_ref_cache", "_deref_cache", "_sample_cache", "_check_cache", "_merged_cache",
+                 "_verdict_cache")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self._ref_cache: Dict[str, Any] = {}
+        self._deref_cache: Dict[str, Any] = {}
+        self._sample_cache: Dict[Tuple[int, str | None], Tuple[Any, Any]] = {}
+        self._check_cache: Dict[int, Tuple[Any, List[Any]]] = {}
+        self._merged_cache: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        self._verdict_cache: Dict[int, Tuple[Any, Optional[str]]] = {}
+
+
+def _resolve_local_ref(doc: Dict[str, Any], ref: str) -> Any:
+    """
+    Resolve a local JSON pointer like "#/components/schemas/User".
+    External refs (URLs, files) are not supported in MVP.
+    """
+    cache = getattr(doc, "_ref_cache", None)
+    if cache is not None:
+        try:
+            return cache[ref]
+        except KeyError:
+            pass
+    cur: Any = doc
+    if not ref.startswith("#/"):
+        # naive: skip external
+        cur = {"$ref": ref}
+    else:
+        try:
+            for p in _pointer_parts(ref):
+                if not isinstance(cur, dict):
+                    raise KeyError(p)
+                cur = cur[p]
+        except KeyError:
+            cur = {"$ref": ref}
+    if cache is not None:
+        cache[ref] = cur
+    return cur
+
+
+@lru_cache(maxsize=4096)
+def _pointer_parts(ref: str) -> Tuple[str, ...]:
+    """Split "#/a/b~1c" into ("a", "b/c"), applying RFC 6901 ~1 and ~0 unescapes."""
+    return tuple(p.replace("~1", "/").replace("~0", "~") for p in ref[2:].split("/"))
+
+
+def _deref(obj: Any, doc: Dict[str, Any]) -> Any:
+    """
+    Follow a $ref chain to its target. Cyclic or unresolvable chains end in a
+    ``{"$ref": ref}`` placeholder instead of recursing forever.
+    """
+    if not (isinstance(obj, dict) and isinstance(obj.get("$ref"), str)):
+        return obj
+    first = obj["$ref"]
+    cache = getattr(doc, "_deref_cache", None)
+    if cache is not None and first in cache:
+        return cache[first]
+    seen: set[str] = set()
+    while isinstance(obj, dict) and isinstance(ref := obj.get("$ref"), str):
+        if ref in seen:
+            obj = {"$ref": ref}
+            break
+        seen.add(ref)
+        obj = _resolve_local_ref(doc, ref)
+    if cache is not None:
+        cache[first] = obj
+    return obj
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import datetime as _dt
-from typing import Any, Dict, Optional
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 
-_UUID = "00000000-0000-4000-8000-000000000000"
-_EMAIL = "user@example.com"
-_DATE = _dt.date(2024, 1, 2).isoformat()
-_DATETIME = _dt.datetime(2024, 1, 2, 3, 4, 5).isoformat() + "Z"
+from .allof_merge import merge_allof
+from .refs import _deref
+from .schema_ast import check_node, first_error
+
+_UUID = sys.intern("00000000-0000-4000-8000-000000000000")
+_EMAIL = sys.intern("user@example.com")
+_DATE = sys.intern(_dt.date(2024, 1, 2).isoformat())
+_DATETIME = sys.intern(_dt.datetime(2024, 1, 2, 3, 4, 5).isoformat() + "Z")
 
 
 def _pick_enum(values: list[Any]) -> Any:
@@ -17,63 +24,93 @@ def _pick_enum(values: list[Any]) -> Any:
     return values[0] if values else None
 
 
+# Exact JSON number types: excludes bool, which isinstance(x, int) would accept
+_NUM_TYPES = frozenset({int, float})
+
+
 def _coerce_number(schema: Dict[str, Any], fallback: int | float = 1) -> int | float:
-    if "example" in schema and isinstance(schema["example"], (int, float)):
-        return schema["example"]
-    if "default" in schema and isinstance(schema["default"], (int, float)):
-        return schema["default"]
+    ex = schema.get("example")
+    if type(ex) in _NUM_TYPES:
+        return ex
+    default = schema.get("default")
+    if type(default) in _NUM_TYPES:
+        return default
     mn = schema.get("minimum")
     mx = schema.get("maximum")
-    if isinstance(mn, (int, float)) and isinstance(mx, (int, float)):
+    mn_ok = type(mn) in _NUM_TYPES
+    mx_ok = type(mx) in _NUM_TYPES
+    if mn_ok and mx_ok:
         try:
             return (mn + mx) / 2
-        except Exception:
+        except OverflowError:  # huge ints have no float midpoint
             return mn
-    if isinstance(mn, (int, float)):
+    if mn_ok:
         return mn
-    if isinstance(mx, (int, float)):
+    if mx_ok:
         return mx
     return fallback
 
 
+_FORMAT_TABLE = {
+    "uuid": _UUID,
+    "date": _DATE,
+    "date-time": _DATETIME,
+    "datetime": _DATETIME,
+    "rfc3339": _DATETIME,
+    "email": _EMAIL,
+    "uri": "https://example.com",
+    "url": "https://example.com",
+}
+# if a hint suggests id/user/page/search, bias to simple demo values
+_NAME_EXACT = {
+    "id": "1",
+    "user_id": "1",
+    "uid": "1",
+    "page": "1",
+    "p": "1",
+    "q": "test",
+    "search": "test",
+}
+
+
 def _coerce_string(schema: Dict[str, Any], name_hint: str | None = None) -> str:
-    fmt = str(schema.get("format") or "").lower()
     ex = schema.get("example")
     if isinstance(ex, str) and ex:
         return ex
     if "enum" in schema and isinstance(schema["enum"], list) and schema["enum"]:
         v = _pick_enum(schema["enum"])
         return str(v)
-    if fmt == "uuid":
-        return _UUID
-    if fmt in ("date",):
-        return _DATE
-    if fmt in ("date-time", "datetime", "rfc3339"):
-        return _DATETIME
-    if fmt in ("email",):
-        return _EMAIL
-    if fmt in ("uri", "url"):
-        return "https://example.com"
-    # if a hint suggests id/user/page, bias to simple demo values
+    fmt = schema.get("format")
+    return _plain_string(str(fmt) if fmt else None, name_hint)
+
+
+@lru_cache(maxsize=2048)
+def _plain_string(fmt: str | None, name_hint: str | None) -> str:
+    """String sample from format / name hint alone; both are hashable, so memoize."""
+    if fmt:
+        hit = _FORMAT_TABLE.get(fmt.lower())
+        if hit is not None:
+            return hit
     if name_hint:
         n = name_hint.lower()
-        if n in ("id", "user_id", "uid"):
-            return "1"
-        if n in ("page", "p"):
-            return "1"
+        hit = _NAME_EXACT.get(n)
+        if hit is not None:
+            return hit
         if "name" in n:
             return "alice"
-        if "query" in n or n in ("q", "search"):
+        if "query" in n:
             return "test"
     # minLength/maximumHints ignored for MVP
     return "1"
 
 
 def _coerce_boolean(schema: Dict[str, Any]) -> bool:
-    if "example" in schema and isinstance(schema["example"], bool):
-        return schema["example"]
-    if "default" in schema and isinstance(schema["default"], bool):
-        return schema["default"]
+    ex = schema.get("example")
+    if type(ex) is bool:
+        return ex
+    default = schema.get("default")
+    if type(default) is bool:
+        return default
     return True
 
 
@@ -101,6 +138,48 @@ def sample_param_value(param: Dict[str, Any]) -> str:
 
 
 def sample_schema_value(schema: Dict[str, Any], name_hint: str | None = None, doc: Dict[str, Any] | None = None) -> Any:
+    """
+    Sample a value for a JSON schema object (for request bodies).
+    Results are memoized per loaded document (see refs._Spec), keyed by the
+    schema object and name hint; callers always get their own copy.
+    """
+    if getattr(doc, "_sample_cache", None) is None:
+        return _sample_schema_value(schema, name_hint, doc)
+    return compile_schema(schema, doc, name_hint)()
+
+
+def compile_schema(schema: Dict[str, Any], doc: Dict[str, Any] | None = None, name_hint: str | None = None) -> Callable[[], Any]:
+    """
+    Return a zero-argument factory of samples for `schema`. The schema tree is
+    walked once; each call only rebuilds the containers of that sample.
+    """
+    cache = getattr(doc, "_sample_cache", None)
+    if cache is None:
+        return _emitter(_sample_schema_value(schema, name_hint, doc))
+    key = (id(schema), name_hint)
+    hit = cache.get(key)
+    if hit is None:
+        # keep the schema alive alongside the factory so its id() cannot be reused
+        hit = cache[key] = (schema, _emitter(_sample_schema_value(schema, name_hint, doc)))
+    return hit[1]
+
+
+def _emitter(value: Any) -> Callable[[], Any]:
+    """Compile a sampled JSON-like value into a factory of independent copies."""
+    if isinstance(value, dict):
+        if any(isinstance(v, (dict, list)) for v in value.values()):
+            fields = [(k, _emitter(v)) for k, v in value.items()]
+            return lambda: {k: make() for k, make in fields}
+        return value.copy
+    if isinstance(value, list):
+        if any(isinstance(v, (dict, list)) for v in value):
+            elements = [_emitter(v) for v in value]
+            return lambda: [make() for make in elements]
+        return value.copy
+    return lambda: value
+
+
+def _sample_schema_value(schema: Dict[str, Any], name_hint: str | None = None, doc: Dict[str, Any] | None = None) -> Any:
     """
     Sample a value for a JSON schema object (for request bodies).
     Enhanced to handle complex schemas: allOf, anyOf, oneOf, additionalProperties, etc.
@@ -112,7 +191,6 @@ def sample_schema_value(schema: Dict[str, Any], name_hint: str | None = None, do
     """
     # Handle $ref if present
     if "$ref" in schema and doc:
-        from .openapi import _deref
         schema = _deref(schema, doc)
         if not isinstance(schema, dict):
             return None
@@ -121,28 +199,15 @@ def sample_schema_value(schema: Dict[str, Any], name_hint: str | None = None, do
     if "enum" in schema and isinstance(schema["enum"], list) and schema["enum"]:
         return _pick_enum(schema["enum"])
     
-    # Handle allOf - merge all schemas
+    # Handle allOf - flatten every branch into one schema (memoized per document)
     if "allOf" in schema and isinstance(schema["allOf"], list) and schema["allOf"]:
-        merged = {}
-        for sub_schema in schema["allOf"]:
-            if isinstance(sub_schema, dict):
-                if "$ref" in sub_schema and doc:
-                    from .openapi import _deref
-                    sub_schema = _deref(sub_schema, doc)
-                if isinstance(sub_schema, dict):
-                    # Merge properties
-                    props = sub_schema.get("properties") or {}
-                    merged.update(props)
-                    # Sample the merged schema
-                    temp_schema = {**schema, "properties": merged, "type": sub_schema.get("type", schema.get("type"))}
-                    return sample_schema_value(temp_schema, name_hint, doc)
+        return sample_schema_value(merge_allof(schema, doc), name_hint, doc)
     
     # Handle oneOf - pick first valid
     if "oneOf" in schema and isinstance(schema["oneOf"], list) and schema["oneOf"]:
         for sub_schema in schema["oneOf"]:
             if isinstance(sub_schema, dict):
                 if "$ref" in sub_schema and doc:
-                    from .openapi import _deref
                     sub_schema = _deref(sub_schema, doc)
                 if isinstance(sub_schema, dict):
                     result = sample_schema_value(sub_schema, name_hint, doc)
@@ -154,7 +219,6 @@ def sample_schema_value(schema: Dict[str, Any], name_hint: str | None = None, do
         first = schema["anyOf"][0] or {}
         if isinstance(first, dict):
             if "$ref" in first and doc:
-                from .openapi import _deref
                 first = _deref(first, doc)
             if isinstance(first, dict):
                 return sample_schema_value(first, name_hint, doc)
@@ -165,200 +229,150 @@ def sample_schema_value(schema: Dict[str, Any], name_hint: str | None = None, do
         # This is a limitation - we can't guarantee it won't match
         pass
     
-    typ = str(schema.get("type") or "").lower()
+    sample = _SAMPLERS.get(str(schema.get("type") or "").lower(), _sample_untyped)
+    return sample(schema, name_hint, doc)
+
+
+def _sample_object(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
+    props = schema.get("properties") or {}
+    required = schema.get("required") or []
+    additional_props = schema.get("additionalProperties")
+    min_props = schema.get("minProperties", 0)
+    
+    out: Dict[str, Any] = {}
     
-    if typ == "object":
-        props = schema.get("properties") or {}
-        required = schema.get("required") or []
-        additional_props = schema.get("additionalProperties")
-        min_props = schema.get("minProperties", 0)
-        
-        out: Dict[str, Any] = {}
-        
-        # Add required properties
+    # Add required properties
+    for k, v in props.items():
+        if k in required or (not required and k in props):  # Include all if no required list
+            if isinstance(v, dict):
+                if "$ref" in v and doc:
+                    v = _deref(v, doc)
+                out[k] = sample_schema_value(v, name_hint=k, doc=doc)
+    
+    # Add optional properties if we haven't met minProperties
+    if len(out) < min_props:
         for k, v in props.items():
-            if k in required or (not required and k in props):  # Include all if no required list
+            if k not in out:
                 if isinstance(v, dict):
                     if "$ref" in v and doc:
-                        from .openapi import _deref
                         v = _deref(v, doc)
                     out[k] = sample_schema_value(v, name_hint=k, doc=doc)
-        
-        # Add optional properties if we haven't met minProperties
-        if len(out) < min_props:
-            for k, v in props.items():
-                if k not in out:
-                    if isinstance(v, dict):
-                        if "$ref" in v and doc:
-                            from .openapi import _deref
-                            v = _deref(v, doc)
-                        out[k] = sample_schema_value(v, name_hint=k, doc=doc)
-                    if len(out) >= min_props:
-                        break
-        
-        # Handle additionalProperties
-        if additional_props is True:
-            # Can add any properties - add a couple of example ones
-            out["extra_field_1"] = "value1"
-            out["extra_field_2"] = 42
-        elif isinstance(additional_props, dict):
-            # additionalProperties has a schema
-            out["additional_field"] = sample_schema_value(additional_props, name_hint="additional", doc=doc)
-        
-        return out
-    
-    if typ == "array":
-        items = schema.get("items") or {}
-        min_items = schema.get("minItems", 0)
-        max_items = schema.get("maxItems")
-        
-        if isinstance(items, dict):
-            if "$ref" in items and doc:
-                from .openapi import _deref
-                items = _deref(items, doc)
-            if isinstance(items, dict):
-                # Generate at least minItems, but cap at maxItems or 3 (reasonable default)
-                count = max(min_items, 1)
-                if max_items is not None:
-                    count = min(count, max_items)
-                else:
-                    count = min(count, 3)  # Reasonable default for arrays
-                return [sample_schema_value(items, name_hint=name_hint, doc=doc) for _ in range(count)]
-        return [] if min_items == 0 else [None]
-    
-    if typ in ("integer", "number"):
-        return _coerce_number(schema)
+                if len(out) >= min_props:
+                    break
     
-    if typ == "boolean":
-        return _coerce_boolean(schema)
+    # Handle additionalProperties
+    if additional_props is True:
+        # Can add any properties - add a couple of example ones
+        out["extra_field_1"] = "value1"
+        out["extra_field_2"] = 42
+    elif isinstance(additional_props, dict):
+        # additionalProperties has a schema
+        out["additional_field"] = sample_schema_value(additional_props, name_hint="additional", doc=doc)
     
-    if typ == "null":
-        return None
-    
-    # Handle string with constraints
-    if typ == "string":
-        result = _coerce_string(schema, name_hint)
-        # Apply minLength/maxLength if specified
-        min_len = schema.get("minLength")
-        max_len = schema.get("maxLength")
-        if min_len is not None and len(result) < min_len:
-            result = result * ((min_len // len(result)) + 1)
-            result = result[:min_len]
-        if max_len is not None and len(result) > max_len:
-            result = result[:max_len]
-        return result
+    return out
+
+
+def _sample_array(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
+    items = schema.get("items") or {}
+    min_items = schema.get("minItems", 0)
+    max_items = schema.get("maxItems")
     
+    if isinstance(items, dict):
+        if "$ref" in items and doc:
+            items = _deref(items, doc)
+        if isinstance(items, dict):
+            # Generate at least minItems, but cap at maxItems or 3 (reasonable default)
+            count = max(min_items, 1)
+            if max_items is not None:
+                count = min(count, max_items)
+            else:
+                count = min(count, 3)  # Reasonable default for arrays
+            if count <= 0:
+                return []
+            # sampling is deterministic: walk `items` once, then copy the sample
+            make = compile_schema(items, doc, name_hint)
+            first = make()
+            if not isinstance(first, (dict, list)):
+                return [first] * count  # immutable scalars can be shared
+            return [first] + [make() for _ in range(count - 1)]
+    return [] if min_items == 0 else [None]
+
+
+def _sample_number(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
+    return _coerce_number(schema)
+
+
+def _sample_boolean(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
+    return _coerce_boolean(schema)
+
+
+def _sample_null(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
+    return None
+
+
+def _sample_string(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
+    result = _coerce_string(schema, name_hint)
+    # Apply minLength/maxLength if specified
+    min_len = schema.get("minLength")
+    max_len = schema.get("maxLength")
+    if min_len is not None and len(result) < min_len:
+        result = result * ((min_len // len(result)) + 1)
+        result = result[:min_len]
+    if max_len is not None and len(result) > max_len:
+        result = result[:max_len]
+    return result
+
+
+def _sample_untyped(schema: Dict[str, Any], name_hint: str | None, doc: Dict[str, Any] | None) -> Any:
     # Fallback to string
     return _coerce_string(schema, name_hint=name_hint)
 
 
+# One lookup per schema node instead of an if/elif chain over the type names
+_SAMPLERS: Dict[str, Callable[[Dict[str, Any], str | None, Dict[str, Any] | None], Any]] = {
+    "object": _sample_object,
+    "array": _sample_array,
+    "integer": _sample_number,
+    "number": _sample_number,
+    "boolean": _sample_boolean,
+    "null": _sample_null,
+    "string": _sample_string,
+}
+
+
+class SampledBody(NamedTuple):
+    """A sampled body plus the validator's verdict on it (None when valid)."""
+    value: Any
+    error: Optional[str]
+
+
+def sample_validated(schema: Dict[str, Any], doc: Dict[str, Any] | None = None) -> SampledBody:
+    """
+    Sample `schema` and validate the sample in one call. Samples are deterministic
+    per schema, so the verdict is memoized per loaded document (see refs._Spec)
+    and shared operations' bodies are only validated once.
+    """
+    value = sample_schema_value(schema, doc=doc)
+    cache = getattr(doc, "_verdict_cache", None)
+    if cache is None:
+        return SampledBody(value, first_error(check_node(schema, doc), value))
+    hit = cache.get(id(schema))
+    if hit is None:
+        # keep the schema alive alongside the verdict so its id() cannot be reused
+        hit = cache[id(schema)] = (schema, first_error(check_node(schema, doc), value))
+    return SampledBody(value, hit[1])
+
+
 def validate_generated_body(body_data: Any, schema: Dict[str, Any], doc: Dict[str, Any] | None = None) -> tuple[bool, str | None]:
     """
     Validate that a generated request body matches the schema constraints.
     Returns (is_valid, error_message).
     
     This is a basic validation - for full validation, use a JSON Schema validator library.
+    The schema is turned into a check tree once per loaded document (see schema_ast).
     """
-    # Handle $ref
-    if "$ref" in schema and doc:
-        from .openapi import _deref
-        schema = _deref(schema, doc)
-        if not isinstance(schema, dict):
-            return False, "Schema reference could not be resolved"
-    
-    typ = str(schema.get("type") or "").lower()
-    
-    # Type checking
-    if typ == "object":
-        if not isinstance(body_data, dict):
-            return False, f"Expected object, got {type(body_data).__name__}"
-        props = schema.get("properties") or {}
-        required = schema.get("required") or []
-        
-        # Check required properties
-        for req_prop in required:
-            if req_prop not in body_data:
-                return False, f"Missing required property: {req_prop}"
-        
-        # Check additionalProperties
-        additional_props = schema.get("additionalProperties")
-        if additional_props is False:
-            # No additional properties allowed
-            for key in body_data:
-                if key not in props:
-                    return False, f"Additional property not allowed: {key}"
-        
-        # Validate each property
-        for key, value in body_data.items():
-            if key in props:
-                prop_schema = props[key]
-                if isinstance(prop_schema, dict):
-                    if "$ref" in prop_schema and doc:
-                        from .openapi import _deref
-                        prop_schema = _deref(prop_schema, doc)
-                    if isinstance(prop_schema, dict):
-                        is_valid, error = validate_generated_body(value, prop_schema, doc)
-                        if not is_valid:
-                            return False, f"Property '{key}': {error}"
-    
-    elif typ == "array":
-        if not isinstance(body_data, list):
-            return False, f"Expected array, got {type(body_data).__name__}"
-        
-        items = schema.get("items") or {}
-        if isinstance(items, dict):
-            if "$ref" in items and doc:
-                from .openapi import _deref
-                items = _deref(items, doc)
-            if isinstance(items, dict):
-                min_items = schema.get("minItems", 0)
-                max_items = schema.get("maxItems")
-                
-                if len(body_data) < min_items:
-                    return False, f"Array has {len(body_data)} items, minimum is {min_items}"
-                if max_items is not None and len(body_data) > max_items:
-                    return False, f"Array has {len(body_data)} items, maximum is {max_items}"
-                
-                # Validate each item
-                for i, item in enumerate(body_data):
-                    is_valid, error = validate_generated_body(item, items, doc)
-                    if not is_valid:
-                        return False, f"Array item {i}: {error}"
-    
-    elif typ in ("integer", "number"):
-        if not isinstance(body_data, (int, float)):
-            return False, f"Expected number, got {type(body_data).__name__}"
-        minimum = schema.get("minimum")
-        maximum = schema.get("maximum")
-        if minimum is not None and body_data < minimum:
-            return False, f"Value {body_data} is less than minimum {minimum}"
-        if maximum is not None and body_data > maximum:
-            return False, f"Value {body_data} is greater than maximum {maximum}"
-    
-    elif typ == "boolean":
-        if not isinstance(body_data, bool):
-            return False, f"Expected boolean, got {type(body_data).__name__}"
-    
-    elif typ == "string":
-        if not isinstance(body_data, str):
-            return False, f"Expected string, got {type(body_data).__name__}"
-        min_len = schema.get("minLength")
-        max_len = schema.get("maxLength")
-        if min_len is not None and len(body_data) < min_len:
-            return False, f"String length {len(body_data)} is less than minLength {min_len}"
-        if max_len is not None and len(body_data) > max_len:
-            return False, f"String length {len(body_data)} is greater than maxLength {max_len}"
-        # Check enum
-        if "enum" in schema and isinstance(schema["enum"], list):
-            if body_data not in schema["enum"]:
-                return False, f"Value '{body_data}' is not in enum {schema['enum']}"
-    
-    elif typ == "null":
-        if body_data is not None:
-            return False, f"Expected null, got {type(body_data).__name__}"
-    
-    # If no type specified, validation passes (could be any type)
-    return True, None
+    error = first_error(check_node(schema, doc), body_data)
+    return error is None, error
 
 
 def fill_server_variables(server_obj: Dict[str, Any]) -> Optional[str]:
@@ -368,15 +382,29 @@ def fill_server_variables(server_obj: Dict[str, Any]) -> Optional[str]:
     url = server_obj.get("url")
     if not isinstance(url, str) or not url:
         return None
+    if "{" not in url:
+        return url
     vars = server_obj.get("variables") or {}
-    for var_name, var_spec in vars.items():
-        rep = None
-        if isinstance(var_spec, dict):
-            if "enum" in var_spec and isinstance(var_spec["enum"], list) and var_spec["enum"]:
-                rep = str(var_spec["enum"][0])
-            elif "default" in var_spec:
-                rep = str(var_spec["default"])
-        if rep is None:
-            rep = ""  # fallback: empty
-        url = url.replace("{" + var_name + "}", rep)
-    return url
+    frozen = tuple((str(name), _server_var_value(spec)) for name, spec in vars.items())
+    return _expand_server(url, frozen)
+
+
+def _server_var_value(var_spec: Any) -> str:
+    if isinstance(var_spec, dict):
+        if "enum" in var_spec and isinstance(var_spec["enum"], list) and var_spec["enum"]:
+            return str(var_spec["enum"][0])
+        if "default" in var_spec:
+            return str(var_spec["default"])
+    return ""  # fallback: empty
+
+
+_SERVER_VAR_RE = re.compile(r"\{([^{}]*)\}")
+
+
+@lru_cache(maxsize=None)
+def _expand_server(url: str, variables: Tuple[Tuple[str, str], ...]) -> str:
+    """Substitute {name} placeholders in one pass; undeclared placeholders are left as-is."""
+    if not variables:
+        return url
+    values = dict(variables)
+    return _SERVER_VAR_RE.sub(lambda m: values.get(m.group(1), m.group(0)), url)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .refs import _deref
+
+# A check node is a list whose first item names its kind:
+#   ["object", required, props, closed, children]   children: {key: node}
+#   ["array", min_items, max_items, item_node]      item_node None → type check only
+#   ["number", minimum, maximum]   ["string", min_len, max_len, enum]
+#   ["boolean"]   ["null"]   ["any"]   ["error", message]
+# $refs are resolved while building, so walking never touches the document.
+Node = List[Any]
+# Where a value sits in the body, built lazily: (parent, label_format, key)
+Where = Optional[Tuple[Any, str, Any]]
+
+
+def check_node(schema: Dict[str, Any], doc: Dict[str, Any] | None) -> Node:
+    """
+    Build the check tree for `schema` once. Trees are memoized per loaded
+    document (see refs._Spec); recursive schemas become cyclic trees.
+    """
+    memo = getattr(doc, "_check_cache", None)
+    return _build(schema, doc, {} if memo is None else memo)
+
+
+def _build(schema: Dict[str, Any], doc: Dict[str, Any] | None, memo: Dict[int, Tuple[Any, Node]]) -> Node:
+    hit = memo.get(id(schema))
+    if hit is not None:
+        return hit[1]
+    node: Node = ["any"]
+    # register before descending so cycles resolve to this node;
+    # keep the schema alive alongside its node so its id() cannot be reused
+    memo[id(schema)] = (schema, node)
+
+    if "$ref" in schema and doc:
+        schema = _deref(schema, doc)
+        if not isinstance(schema, dict):
+            node[:] = ["error", "Schema reference could not be resolved"]
+            return node
+
+    typ = str(schema.get("type") or "").lower()
+    if typ == "object":
+        props = schema.get("properties") or {}
+        children: Dict[str, Node] = {}
+        node[:] = ["object", schema.get("required") or [], props,
+                   schema.get("additionalProperties") is False, children]
+        for key, prop_schema in (props.items() if isinstance(props, dict) else ()):
+            if isinstance(prop_schema, dict) and "$ref" in prop_schema and doc:
+                prop_schema = _deref(prop_schema, doc)
+            if isinstance(prop_schema, dict):
+                children[key] = _build(prop_schema, doc, memo)
+    elif typ == "array":
+        items = schema.get("items") or {}
+        if isinstance(items, dict) and "$ref" in items and doc:
+            items = _deref(items, doc)
+        node[:] = ["array", schema.get("minItems", 0), schema.get("maxItems"), None]
+        if isinstance(items, dict):
+            node[3] = _build(items, doc, memo)
+    elif typ in ("integer", "number"):
+        node[:] = ["number", schema.get("minimum"), schema.get("maximum")]
+    elif typ == "boolean":
+        node[:] = ["boolean"]
+    elif typ == "string":
+        enum = schema.get("enum")
+        node[:] = ["string", schema.get("minLength"), schema.get("maxLength"),
+                   enum if isinstance(enum, list) else None]
+    elif typ == "null":
+        node[:] = ["null"]
+    # If no type specified, validation passes (could be any type)
+    return node
+
+
+def first_error(node: Node, value: Any) -> Optional[str]:
+    """
+    Walk `value` against a check tree depth-first with an explicit stack and
+    return the first error message (None when valid).
+    """
+    stack: List[Tuple[Node, Any, Where]] = [(node, value, None)]
+    pop = stack.pop
+    while stack:
+        node, value, where = pop()
+        error = _HANDLERS[node[0]](node, value, stack, where)
+        if error is not None:
+            return _label(where) + error
+    return None
+
+
+def _label(where: Where) -> str:
+    parts: List[str] = []
+    while where is not None:
+        where, fmt, key = where
+        parts.append(fmt.format(key))
+    return "".join(reversed(parts))
+
+
+def _type_error(expected: str, value: Any) -> str:
+    return f"Expected {expected}, got {type(value).__name__}"
+
+
+def _check_object(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    _, required, props, closed, children = node
+    if not isinstance(value, dict):
+        return _type_error("object", value)
+    for req_prop in required:
+        if req_prop not in value:
+            return f"Missing required property: {req_prop}"
+    if closed:
+        for key in value:
+            if key not in props:
+                return f"Additional property not allowed: {key}"
+    if children:
+        # pushed in reverse so properties are checked in body order
+        pending = [(child, item, (where, "Property '{}': ", key))
+                   for key, item in value.items() if (child := children.get(key)) is not None]
+        pending.reverse()
+        stack.extend(pending)
+    return None
+
+
+def _check_array(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    _, min_items, max_items, item_node = node
+    if not isinstance(value, list):
+        return _type_error("array", value)
+    if item_node is None:
+        return None
+    if len(value) < min_items:
+        return f"Array has {len(value)} items, minimum is {min_items}"
+    if max_items is not None and len(value) > max_items:
+        return f"Array has {len(value)} items, maximum is {max_items}"
+    for i in range(len(value) - 1, -1, -1):
+        stack.append((item_node, value[i], (where, "Array item {}: ", i)))
+    return None
+
+
+def _check_number(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    _, minimum, maximum = node
+    if not isinstance(value, (int, float)):
+        return _type_error("number", value)
+    if minimum is not None and value < minimum:
+        return f"Value {value} is less than minimum {minimum}"
+    if maximum is not None and value > maximum:
+        return f"Value {value} is greater than maximum {maximum}"
+    return None
+
+
+def _check_string(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    _, min_len, max_len, enum = node
+    if not isinstance(value, str):
+        return _type_error("string", value)
+    if min_len is not None and len(value) < min_len:
+        return f"String length {len(value)} is less than minLength {min_len}"
+    if max_len is not None and len(value) > max_len:
+        return f"String length {len(value)} is greater than maxLength {max_len}"
+    if enum is not None and value not in enum:
+        return f"Value '{value}' is not in enum {enum}"
+    return None
+
+
+def _check_boolean(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    return None if isinstance(value, bool) else _type_error("boolean", value)
+
+
+def _check_null(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    return None if value is None else _type_error("null", value)
+
+
+def _check_any(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    return None
+
+
+def _check_error(node: Node, value: Any, stack: List[Any], where: Where) -> Optional[str]:
+    return node[1]
+
+
+_HANDLERS: Dict[str, Callable[[Node, Any, List[Any], Where], Optional[str]]] = {
+    "object": _check_object,
+    "array": _check_array,
+    "number": _check_number,
+    "string": _check_string,
+    "boolean": _check_boolean,
+    "null": _check_null,
+    "any": _check_any,
+    "error": _check_error,
+}
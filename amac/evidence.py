@@ -1,21 +1,36 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Set
 
 from ._json import dumps
 
+# Parent directories already created by this process; a run writes hundreds of
+# snapshots into the same few directories, so skip the repeated mkdir syscalls.
+_made_dirs: Set[Path] = set()
+
 
 def write_snapshot(obj: Any, path: Path) -> None:
     """Write a request/response snapshot to disk as pretty JSON."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if hasattr(obj, "model_dump"):
-        payload = obj.model_dump()
+    serializer = getattr(obj, "__pydantic_serializer__", None)
+    if serializer is not None:
+        # pydantic v2 models serialize straight to JSON bytes, no dict round-trip
+        data = serializer.to_json(obj, indent=2)
     else:
         try:
             payload = obj.__dict__  # dataclasses etc.
         except Exception:
             payload = obj
-    path.write_bytes(dumps(payload))
+        data = dumps(payload, indent=2)
+
+    parent = path.parent
+    if parent not in _made_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _made_dirs.add(parent)
+    try:
+        path.write_bytes(data)
+    except FileNotFoundError:  # directory removed since we created it
+        parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
 
 __all__ = ["write_snapshot"]
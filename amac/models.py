@@ -1,23 +1,216 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Optional
+import os
+import re
+import sys
+from fnmatch import translate
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Literal, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
 
 try:  # Prefer real Pydantic models
-    from pydantic import BaseModel, Field, field_validator, model_validator
+    from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
     _USE_PYDANTIC = True
 except ModuleNotFoundError:  # pragma: no cover - fallback when pydantic missing
     BaseModel = None  # type: ignore
-    Field = field_validator = model_validator = None  # type: ignore
+    ConfigDict = Field = field_validator = model_validator = None  # type: ignore
     _USE_PYDANTIC = False
 
 PrivacyLevel = Literal["none", "minimal", "strict"]
 HttpMethod = Literal["GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"]
 
+# Host patterns split into exact names and "*." wildcard suffixes (dot kept, so
+# "*.example.com" -> ".example.com", which never matches the naked domain).
+# Suffixes are kept both as a tuple (for str.endswith on short lists) and as a
+# frozenset (for a per-label lookup on long lists).
+HostPatternSets = Tuple[FrozenSet[str], Tuple[str, ...], FrozenSet[str]]
+
+
+def _host_pattern_sets(patterns: Iterable[str]) -> HostPatternSets:
+    exact = set()
+    suffixes = []
+    for p in patterns:
+        p = p.lower()
+        if p.startswith("*."):
+            suffixes.append(p[1:])
+        else:
+            exact.add(p)
+    return frozenset(exact), tuple(suffixes), frozenset(suffixes)
+
+
+# Above this many wildcard patterns, walking the host's labels (one set lookup
+# per label) beats str.endswith over every suffix.
+_SUFFIX_SCAN_MAX = 16
+
+
+def _host_in(sets: HostPatternSets, host: str) -> bool:
+    """``any_match`` over pre-split pattern sets: exact-host lookup, then wildcard suffixes."""
+    exact, suffixes, suffix_set = sets
+    if host in exact:
+        return True
+    if len(suffixes) <= _SUFFIX_SCAN_MAX:
+        return bool(suffixes) and host.endswith(suffixes)
+    i = host.find(".")
+    while i != -1:
+        if host[i:] in suffix_set:
+            return True
+        i = host.find(".", i + 1)
+    return False
+
+
+def _scope_matches_host(scope: Any, host: str) -> bool:
+    if scope.denied and _host_in(scope.denied_hosts, host):
+        return False
+    if scope.allowed:
+        return _host_in(scope.allowed_hosts, host)
+    # If `allowed` is empty but base_urls were provided, allow hosts from base_urls.
+    return host in scope.base_hosts
+
+
+def _base_hosts(base_urls: Iterable[str]) -> FrozenSet[str]:
+    hosts = set()
+    for u in base_urls:
+        host = urlsplit(u).hostname
+        if not host:
+            raise ValueError(f"Invalid absolute URL (no hostname): {u}")
+        hosts.add(host.lower())
+    return frozenset(hosts)
+
+
+# Path allow/deny patterns compiled to (is_regex, pattern) rules: regex rules are
+# searched, glob rules are matched against the normcase'd, '/'-prefixed path.
+PathRules = Tuple[Tuple[bool, "re.Pattern[str]"], ...]
+
+
+# Flags a plain str pattern compiles with; anything beyond these came from a
+# global inline flag such as ``(?i)``.
+_DEFAULT_RE_FLAGS = re.compile("").flags
+
+
+@lru_cache(maxsize=512)
+def _compile(pattern: str) -> re.Pattern[str] | None:
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _compiled_path_rules(patterns: Tuple[str, ...]) -> PathRules:
+    """
+    Compile a pattern list once into ``(is_regex, compiled)`` rules.
+    All globs are joined into one alternation, and so are the regexes that can be
+    (no capture groups, no global inline flags), so a path is usually checked
+    with one or two scans regardless of how many patterns there are.
+    Invalid regular expressions never match, so they are dropped here (an allow
+    list made only of invalid regexes still allows nothing; see config).
+    """
+    globs: List[str] = []
+    regexes: List[str] = []
+    rules: List[Tuple[bool, re.Pattern[str]]] = []
+    for pattern in patterns:
+        if pattern.startswith("re:"):
+            rx = _compile(pattern[3:])
+            if rx is None:
+                continue
+            # A global inline flag would leak onto every other alternative (3.10 only
+            # warns when it is not leading), so such regexes are never joined.
+            if (
+                rx.groups == 0
+                and rx.flags == _DEFAULT_RE_FLAGS
+                and _compile(f"(?:{rx.pattern})") is not None
+            ):
+                regexes.append(rx.pattern)
+            else:
+                rules.append((True, rx))
+        else:
+            glob = pattern if pattern.startswith("/") else "/" + pattern
+            globs.append(translate(os.path.normcase(glob)))
+    if regexes:
+        rules.insert(0, (True, _union(regexes)))
+    if globs:
+        rules.insert(0, (False, _union(globs)))
+    return tuple(rules)
+
+
+def _union(patterns: List[str]) -> re.Pattern[str]:
+    if len(patterns) == 1:
+        return re.compile(patterns[0])
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+# Per-type required-field checks for AuthScheme, looked up by `type`.
+def _check_bearer(a: Any) -> None:
+    if not a.token:
+        raise ValueError("bearer auth requires `token`")
+
+
+def _check_cookie(a: Any) -> None:
+    if not a.cookie:
+        raise ValueError("cookie auth requires `cookie`")
+
+
+def _check_basic(a: Any) -> None:
+    if not (a.username and a.password):
+        raise ValueError("basic auth requires `username` and `password`")
+
+
+def _check_header(a: Any) -> None:
+    if not (a.header and a.token):
+        raise ValueError("header auth requires `header` and `token`")
+
+
+def _check_oauth2_client_credentials(a: Any) -> None:
+    if not (a.client_id and a.client_secret):
+        raise ValueError("oauth2 client_credentials requires client_id and client_secret")
+
+
+def _check_oauth2_password(a: Any) -> None:
+    if not (a.client_id and a.client_secret and a.username and a.password):
+        raise ValueError(
+            "oauth2 password grant requires client_id, client_secret, username, password"
+        )
+
+
+_OAUTH2_GRANT_CHECKS: Dict[str, Callable[[Any], None]] = {
+    "client_credentials": _check_oauth2_client_credentials,
+    "password": _check_oauth2_password,
+}
+
+
+def _check_oauth2(a: Any) -> None:
+    if not a.token_url:
+        raise ValueError("oauth2 requires `token_url`")
+    check = _OAUTH2_GRANT_CHECKS.get(a.grant_type)
+    if check is None:
+        raise ValueError("oauth2.grant_type must be client_credentials or password")
+    check(a)
+
+
+def _check_form_login(a: Any) -> None:
+    if not (a.login_url and a.username_field and a.password_field and a.username and a.password):
+        raise ValueError(
+            "form_login requires login_url, username_field, password_field, username, password"
+        )
+
+
+_AUTH_CHECKS: Dict[str, Callable[[Any], None]] = {
+    "bearer": _check_bearer,
+    "cookie": _check_cookie,
+    "basic": _check_basic,
+    "header": _check_header,
+    "oauth2": _check_oauth2,
+    "form_login": _check_form_login,
+}
+
+
 if _USE_PYDANTIC:
     # ------------------------------------------------------------------
     # Pydantic models (original implementations)
     # ------------------------------------------------------------------
     class EvidencePolicy(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
         privacy_level: PrivacyLevel = Field(
             default="minimal",
             description="Controls PII redaction in snippets/headers: none|minimal|strict.",
@@ -54,10 +247,14 @@ if _USE_PYDANTIC:
         )
 
     class Timeouts(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
         connect: int = Field(default=5, ge=1, description="Connect timeout seconds.")
         read: int = Field(default=15, ge=1, description="Read timeout seconds.")
 
     class PathPolicy(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
         allow_paths: List[str] = Field(
             default_factory=list,
             description="Optional glob/regex-like patterns to ALLOW (match against URL path). Empty = allow all.",
@@ -74,9 +271,24 @@ if _USE_PYDANTIC:
                 return []
             if not isinstance(v, list):
                 raise TypeError("allow_paths/deny_paths must be lists of strings")
+            # already-normalized lists (e.g. a re-loaded config) pass through untouched
+            if all(type(s) is str and s == s.strip() for s in v):
+                return v
             return [str(s).strip() for s in v]
 
+        @cached_property
+        def allow_rules(self) -> Optional[PathRules]:
+            """Compiled allow_paths; None when there is no allow list (allow all)."""
+            return _compiled_path_rules(tuple(self.allow_paths)) if self.allow_paths else None
+
+        @cached_property
+        def deny_rules(self) -> PathRules:
+            """Compiled deny_paths, built once per policy."""
+            return _compiled_path_rules(tuple(self.deny_paths))
+
     class ScopeConfig(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
         allowed: List[str] = Field(default_factory=list)
         base_urls: List[str] = Field(default_factory=list)
         denied: List[str] = Field(default_factory=list)
@@ -94,6 +306,25 @@ if _USE_PYDANTIC:
                 )
             return self
 
+        @cached_property
+        def base_hosts(self) -> FrozenSet[str]:
+            """Lowercased hostnames of ``base_urls``, computed once per config."""
+            return _base_hosts(self.base_urls)
+
+        @cached_property
+        def allowed_hosts(self) -> HostPatternSets:
+            """``allowed`` split into exact hosts and wildcard suffixes, computed once per config."""
+            return _host_pattern_sets(self.allowed)
+
+        @cached_property
+        def denied_hosts(self) -> HostPatternSets:
+            """``denied`` split into exact hosts and wildcard suffixes, computed once per config."""
+            return _host_pattern_sets(self.denied)
+
+        def matches_host(self, host: str) -> bool:
+            """Whether a lowercased host is in scope (denied, then allowed or base_urls hosts)."""
+            return _scope_matches_host(self, host)
+
     class AuthScheme(BaseModel):
         audience: Optional[str] = None
         name: str
@@ -117,56 +348,18 @@ if _USE_PYDANTIC:
 
         @model_validator(mode="after")
         def _validate_by_type(self) -> "AuthScheme":
-            t = self.type
-            if t == "bearer":
-                if not self.token:
-                    raise ValueError("bearer auth requires `token`")
-            elif t == "cookie":
-                if not self.cookie:
-                    raise ValueError("cookie auth requires `cookie`")
-            elif t == "basic":
-                if not (self.username and self.password):
-                    raise ValueError("basic auth requires `username` and `password`")
-            elif t == "header":
-                if not (self.header and self.token):
-                    raise ValueError("header auth requires `header` and `token`")
-            elif t == "oauth2":
-                if not self.token_url:
-                    raise ValueError("oauth2 requires `token_url`")
-                if self.grant_type not in ("client_credentials", "password"):
-                    raise ValueError("oauth2.grant_type must be client_credentials or password")
-                if self.grant_type == "client_credentials":
-                    if not (self.client_id and self.client_secret):
-                        raise ValueError(
-                            "oauth2 client_credentials requires client_id and client_secret"
-                        )
-                if self.grant_type == "password":
-                    if not (
-                        self.client_id
-                        and self.client_secret
-                        and self.username
-                        and self.password
-                    ):
-                        raise ValueError(
-                            "oauth2 password grant requires client_id, client_secret, username, password"
-                        )
-            elif t == "form_login":
-                if not (
-                    self.login_url
-                    and self.username_field
-                    and self.password_field
-                    and self.username
-                    and self.password
-                ):
-                    raise ValueError(
-                        "form_login requires login_url, username_field, password_field, username, password"
-                    )
+            check = _AUTH_CHECKS.get(self.type)
+            if check is not None:
+                check(self)
             return self
 
     class AuthConfig(BaseModel):
         auth_schemes: List[AuthScheme] = Field(default_factory=list)
 
     class Endpoint(BaseModel):
+        # immutable once mapped; url_parts is cached straight into __dict__
+        model_config = ConfigDict(frozen=True)
+
         method: HttpMethod
         url: str
         requires_auth: Optional[bool] = Field(
@@ -184,17 +377,34 @@ if _USE_PYDANTIC:
             default_factory=dict, description="Room for future fields without breaking schema."
         )
 
+        @cached_property
+        def url_parts(self) -> SplitResult:
+            """``urlsplit(url)``, computed once and reused by the scope checks."""
+            return urlsplit(self.url)
+
+        @classmethod
+        def make_trusted(cls, **fields: Any) -> "Endpoint":
+            """Build from values AMAC produced itself (already well-typed), skipping validation."""
+            return cls.model_construct(**fields)
+
     class EndpointSet(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
         generated_by: str = "amac"
         version: str = "0.1.0"
         endpoints: List[Endpoint] = Field(default_factory=list)
+
+        @classmethod
+        def make_trusted(cls, **fields: Any) -> "EndpointSet":
+            """Build from already-constructed endpoints, skipping validation."""
+            return cls.model_construct(**fields)
 else:
     # ------------------------------------------------------------------
     # Lightweight dataclass fallbacks used when pydantic is unavailable
     # ------------------------------------------------------------------
     from dataclasses import dataclass, field
 
-    @dataclass
+    @dataclass(slots=True, frozen=True)
     class EvidencePolicy:
         privacy_level: PrivacyLevel = "minimal"
 
@@ -211,17 +421,25 @@ else:
         verify_tls: bool = True
         hard_request_budget: int = 0
 
-    @dataclass
+    @dataclass(slots=True, frozen=True)
     class Timeouts:
         connect: int = 5
         read: int = 15
 
-    @dataclass
+    @dataclass(frozen=True)  # no slots: cached_property needs __dict__
     class PathPolicy:
         allow_paths: List[str] = field(default_factory=list)
         deny_paths: List[str] = field(default_factory=list)
 
-    @dataclass
+        @cached_property
+        def allow_rules(self) -> Optional[PathRules]:
+            return _compiled_path_rules(tuple(self.allow_paths)) if self.allow_paths else None
+
+        @cached_property
+        def deny_rules(self) -> PathRules:
+            return _compiled_path_rules(tuple(self.deny_paths))
+
+    @dataclass(frozen=True)
     class ScopeConfig:
         allowed: List[str] = field(default_factory=list)
         base_urls: List[str] = field(default_factory=list)
@@ -232,6 +450,21 @@ else:
         evidence: EvidencePolicy = field(default_factory=EvidencePolicy)
         evidence_dir: str = "./evidence"
 
+        @cached_property
+        def base_hosts(self) -> FrozenSet[str]:
+            return _base_hosts(self.base_urls)
+
+        @cached_property
+        def allowed_hosts(self) -> HostPatternSets:
+            return _host_pattern_sets(self.allowed)
+
+        @cached_property
+        def denied_hosts(self) -> HostPatternSets:
+            return _host_pattern_sets(self.denied)
+
+        def matches_host(self, host: str) -> bool:
+            return _scope_matches_host(self, host)
+
     @dataclass
     class AuthScheme:
         name: str
@@ -255,7 +488,7 @@ else:
     class AuthConfig:
         auth_schemes: List[AuthScheme] = field(default_factory=list)
 
-    @dataclass
+    @dataclass(frozen=True)  # no slots: cached_property needs __dict__
     class Endpoint:
         method: HttpMethod
         url: str
@@ -266,8 +499,42 @@ else:
         operation_id: Optional[str] = None
         extra: Dict[str, Any] = field(default_factory=dict)
 
-    @dataclass
+        def __post_init__(self) -> None:
+            # one shared str per verb across all endpoints (pydantic's Literal does this itself)
+            object.__setattr__(self, "method", sys.intern(self.method))
+
+        @cached_property
+        def url_parts(self) -> SplitResult:
+            return urlsplit(self.url)
+
+        @classmethod
+        def make_trusted(cls, **fields: Any) -> "Endpoint":
+            return cls(**fields)
+
+    @dataclass(frozen=True)
     class EndpointSet:
         generated_by: str = "amac"
         version: str = "0.1.0"
         endpoints: List[Endpoint] = field(default_factory=list)
+
+        @classmethod
+        def make_trusted(cls, **fields: Any) -> "EndpointSet":
+            return cls(**fields)
+
+
+def load_endpointset_json(data: bytes | str) -> EndpointSet:
+    """
+    Parse and validate an endpoints.json document. With pydantic this is a
+    single model_validate_json pass (no dict round-trip); the fallback parses
+    the JSON and builds the dataclasses.
+    """
+    if _USE_PYDANTIC:
+        return EndpointSet.model_validate_json(data)
+    from ._json import loads
+
+    raw = loads(data)
+    return EndpointSet(
+        generated_by=str(raw.get("generated_by", "amac")),
+        version=str(raw.get("version", "0.1.0")),
+        endpoints=[Endpoint(**item) for item in raw.get("endpoints", []) or []],
+    )
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import html
+import mmap
+import os
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from .._json import loads
 from ..diffing import analyze_summary
 
+# Above this size summary/findings files are parsed straight from a read-only
+# mapping instead of being copied into a bytes object first.
+_MMAP_MIN_BYTES = 1 << 20
+
 
 def _read_json(path: Path) -> Dict[str, Any]:
-    return loads(path.read_bytes())
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < _MMAP_MIN_BYTES:
+            return loads(fh.read())
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return loads(view)
 
 
 def _fmt_dt(dt: datetime) -> str:
@@ -18,65 +30,121 @@ def _fmt_dt(dt: datetime) -> str:
 
 
 def _h(s: Any) -> str:
-    return html.escape(str(s), quote=True)
+    if type(s) is not str:
+        s = str(s)
+    # most cells (URLs, verbs, names) need no escaping; each `in` is a C-level scan
+    if "&" in s or "<" in s or ">" in s or '"' in s or "'" in s:
+        return html.escape(s, quote=True)
+    return s
+
+
+def _n(v: Any) -> str:
+    """Escape a numeric cell; ints and None (status codes, sizes) never need escaping."""
+    return str(v) if v is None or type(v) is int else _h(v)
+
+
+# Page stylesheet; a plain constant so the CSS needs no f-string brace escaping.
+_STYLE = """\
+  :root {
+    --bg: #0f1115;
+    --card: #161a22;
+    --text: #e6e6e6;
+    --muted: #a0a4ad;
+    --accent: #6ea8fe;
+    --ok: #49d36d;
+    --warn: #ffd166;
+    --bad: #ff6b6b;
+    --border: #2a2f3a;
+    --mono: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace;
+  }
+  html, body { background: var(--bg); color: var(--text); margin: 0; padding: 0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, 'Helvetica Neue', Arial, 'Noto Sans', 'Apple Color Emoji', 'Segoe UI Emoji'; }
+  .wrap { max-width: 1100px; margin: 40px auto; padding: 0 16px; }
+  h1, h2, h3 { margin: 0 0 12px; }
+  .card { background: var(--card); border: 1px solid var(--border); border-radius: 14px; padding: 16px 18px; margin: 16px 0; }
+  .meta { color: var(--muted); font-size: 0.95rem; }
+  code, .url { font-family: var(--mono); }
+  table { width: 100%; border-collapse: collapse; }
+  .zebra thead th { text-align: left; border-bottom: 1px solid var(--border); padding: 8px; }
+  .zebra td { padding: 8px; border-bottom: 1px solid var(--border); vertical-align: top; }
+  .pill { display: inline-block; padding: 2px 8px; border-radius: 999px; font-size: 0.8rem; border: 1px solid var(--border); }
+  .sev-HIGH { background: rgba(255, 107, 107, .12); border-color: #ff6b6b; color: #ff9a9a; }
+  .sev-MEDIUM { background: rgba(255, 209, 102, .12); border-color: #ffd166; color: #ffe1a3; }
+  .sev-LOW { background: rgba(110, 168, 254, .12); border-color: #6ea8fe; color: #a6c6ff; }
+  .grid { display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; }
+  .stat { background: var(--card); border: 1px solid var(--border); border-radius: 12px; padding: 12px; text-align: center; }
+  .stat .num { font-size: 1.4rem; font-weight: 700; }
+  .muted { color: var(--muted); }
+  footer { color: var(--muted); font-size: .9rem; margin: 24px 0; }
+"""
+
+
+_REQ_AUTH_STR = {True: "yes", False: "no", None: "unknown"}
 
+# summary.json row keys in table column order, fetched with one itemgetter call per row
+_SUMMARY_KEYS = ("index", "method", "url", "requires_auth", "noauth_status",
+                 "auth_name", "auth_status", "noauth_size", "auth_size")
+_SUMMARY_CELLS = itemgetter(*_SUMMARY_KEYS)
 
-def _build_findings_table(findings: List[Dict[str, Any]]) -> str:
+
+def _iter_findings_table(findings: List[Dict[str, Any]]) -> Iterator[str]:
     if not findings:
-        return "<p><em>No findings under current heuristics.</em></p>"
+        yield "<p><em>No findings under current heuristics.</em></p>"
+        return
 
-    rows = []
-    for f in findings:
-        rows.append(
-            "<tr>"
-            f"<td>{_h(f.get('severity','').upper())}</td>"
-            f"<td>{_h(f.get('type',''))}</td>"
-            f"<td>{_h(f.get('method',''))}</td>"
-            f"<td class='url'>{_h(f.get('url',''))}</td>"
-            f"<td>{_h(f.get('noauth_status'))} → {_h(f.get('auth_status'))}</td>"
-            f"<td>{_h(f.get('delta_size'))}</td>"
-            f"<td>{_h(f.get('notes',''))}</td>"
-            "</tr>"
-        )
-    return (
+    yield (
         "<table class='zebra'>"
         "<thead><tr>"
         "<th>Severity</th><th>Type</th><th>Method</th><th>URL</th>"
         "<th>no→auth</th><th>Δsize</th><th>Notes</th>"
         "</tr></thead>"
-        f"<tbody>{''.join(rows)}</tbody>"
-        "</table>"
+        "<tbody>"
     )
-
-
-def _build_summary_table(summary: Dict[str, Any]) -> str:
-    rows_html = []
-    rows = summary.get("rows", [])
-    for r in rows:
-        req_auth = r.get("requires_auth")
-        req_auth_str = "yes" if req_auth is True else "no" if req_auth is False else "unknown"
-        rows_html.append(
+    for f in findings:
+        get = f.get
+        yield (
             "<tr>"
-            f"<td>{_h(r.get('index'))}</td>"
-            f"<td>{_h(r.get('method'))}</td>"
-            f"<td class='url'>{_h(r.get('url'))}</td>"
-            f"<td>{_h(req_auth_str)}</td>"
-            f"<td>{_h(r.get('noauth_status'))}</td>"
-            f"<td>{_h(r.get('auth_name'))}</td>"
-            f"<td>{_h(r.get('auth_status'))}</td>"
-            f"<td>{_h(r.get('noauth_size'))}</td>"
-            f"<td>{_h(r.get('auth_size'))}</td>"
+            f"<td>{_h(get('severity', '').upper())}</td>"
+            f"<td>{_h(get('type', ''))}</td>"
+            f"<td>{_h(get('method', ''))}</td>"
+            f"<td class='url'>{_h(get('url', ''))}</td>"
+            f"<td>{_n(get('noauth_status'))} → {_n(get('auth_status'))}</td>"
+            f"<td>{_n(get('delta_size'))}</td>"
+            f"<td>{_h(get('notes', ''))}</td>"
             "</tr>"
         )
-    return (
+    yield "</tbody></table>"
+
+
+def _iter_summary_table(rows: List[Dict[str, Any]]) -> Iterator[str]:
+    yield (
         "<table class='zebra'>"
         "<thead><tr>"
         "<th>#</th><th>Method</th><th>URL</th><th>Req. Auth?</th>"
         "<th>No-Auth</th><th>Auth</th><th>Auth Status</th><th>No Size</th><th>Auth Size</th>"
         "</tr></thead>"
-        f"<tbody>{''.join(rows_html)}</tbody>"
-        "</table>"
+        "<tbody>"
     )
+    for r in rows:
+        try:
+            cells = _SUMMARY_CELLS(r)
+        except KeyError:  # hand-edited or older summary missing a column
+            cells = tuple(map(r.get, _SUMMARY_KEYS))
+        (index, method, url, req_auth, noauth_status,
+         auth_name, auth_status, noauth_size, auth_size) = cells
+        yield (
+            "<tr>"
+            f"<td>{_n(index)}</td>"
+            f"<td>{_h(method)}</td>"
+            f"<td class='url'>{_h(url)}</td>"
+            f"<td>{_REQ_AUTH_STR.get(req_auth, 'unknown')}</td>"
+            f"<td>{_n(noauth_status)}</td>"
+            f"<td>{_h(auth_name)}</td>"
+            f"<td>{_n(auth_status)}</td>"
+            f"<td>{_n(noauth_size)}</td>"
+            f"<td>{_n(auth_size)}</td>"
+            "</tr>"
+        )
+    yield "</tbody></table>"
 
 
 def render_report(run_dir: Path, out_html: Path | None = None) -> Path:
@@ -103,55 +171,27 @@ def render_report(run_dir: Path, out_html: Path | None = None) -> Path:
     else:
         findings = analyze_summary(summary)
 
+    rows = summary.get("rows", [])
     counts = findings.get("counts", {})
-    total_eps = counts.get("total_endpoints", len(summary.get("rows", [])))
+    total_eps = counts.get("total_endpoints", len(rows))
     total_findings = counts.get("total_findings", 0)
-    by_sev = findings.get("counts", {}).get("by_severity", {})
-    by_type = findings.get("counts", {}).get("by_type", {})
+    by_sev = counts.get("by_severity", {})
+    by_type = counts.get("by_type", {})
 
-    html_doc = f"""<!DOCTYPE html>
+    generated = _fmt_dt(datetime.now())
+    head = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="utf-8">
 <title>AMAC Report — {_h(run_dir)}</title>
 <meta name="viewport" content="width=device-width, initial-scale=1">
 <style>
-  :root {{
-    --bg: #0f1115;
-    --card: #161a22;
-    --text: #e6e6e6;
-    --muted: #a0a4ad;
-    --accent: #6ea8fe;
-    --ok: #49d36d;
-    --warn: #ffd166;
-    --bad: #ff6b6b;
-    --border: #2a2f3a;
-    --mono: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace;
-  }}
-  html, body {{ background: var(--bg); color: var(--text); margin: 0; padding: 0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, 'Helvetica Neue', Arial, 'Noto Sans', 'Apple Color Emoji', 'Segoe UI Emoji'; }}
-  .wrap {{ max-width: 1100px; margin: 40px auto; padding: 0 16px; }}
-  h1, h2, h3 {{ margin: 0 0 12px; }}
-  .card {{ background: var(--card); border: 1px solid var(--border); border-radius: 14px; padding: 16px 18px; margin: 16px 0; }}
-  .meta {{ color: var(--muted); font-size: 0.95rem; }}
-  code, .url {{ font-family: var(--mono); }}
-  table {{ width: 100%; border-collapse: collapse; }}
-  .zebra thead th {{ text-align: left; border-bottom: 1px solid var(--border); padding: 8px; }}
-  .zebra td {{ padding: 8px; border-bottom: 1px solid var(--border); vertical-align: top; }}
-  .pill {{ display: inline-block; padding: 2px 8px; border-radius: 999px; font-size: 0.8rem; border: 1px solid var(--border); }}
-  .sev-HIGH {{ background: rgba(255, 107, 107, .12); border-color: #ff6b6b; color: #ff9a9a; }}
-  .sev-MEDIUM {{ background: rgba(255, 209, 102, .12); border-color: #ffd166; color: #ffe1a3; }}
-  .sev-LOW {{ background: rgba(110, 168, 254, .12); border-color: #6ea8fe; color: #a6c6ff; }}
-  .grid {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; }}
-  .stat {{ background: var(--card); border: 1px solid var(--border); border-radius: 12px; padding: 12px; text-align: center; }}
-  .stat .num {{ font-size: 1.4rem; font-weight: 700; }}
-  .muted {{ color: var(--muted); }}
-  footer {{ color: var(--muted); font-size: .9rem; margin: 24px 0; }}
-</style>
+{_STYLE}</style>
 </head>
 <body>
 <div class="wrap">
   <h1>AMAC Report</h1>
-  <div class="meta">Run dir: <code>{_h(run_dir)}</code> · Generated: {_h(_fmt_dt(datetime.now()))}</div>
+  <div class="meta">Run dir: <code>{_h(run_dir)}</code> · Generated: {_h(generated)}</div>
 
   <div class="grid" style="margin:16px 0 8px;">
     <div class="stat"><div class="muted">Endpoints</div><div class="num">{_h(total_eps)}</div></div>
@@ -162,12 +202,14 @@ def render_report(run_dir: Path, out_html: Path | None = None) -> Path:
   <div class="card">
     <h2>Findings</h2>
     <div class="muted" style="margin-bottom:8px">By Severity: {_h(by_sev)} · By Type: {_h(by_type)}</div>
-    {_build_findings_table(findings.get('findings', []))}
+    """
+    middle = """
   </div>
 
   <div class="card">
     <h2>Endpoint Summary</h2>
-    {_build_summary_table(summary)}
+    """
+    tail = f"""
   </div>
 
   <footer>
@@ -179,5 +221,11 @@ def render_report(run_dir: Path, out_html: Path | None = None) -> Path:
 """
     out_html = Path(out_html)
     out_html.parent.mkdir(parents=True, exist_ok=True)
-    out_html.write_text(html_doc, encoding="utf-8")
+    # stream the table rows straight to the file instead of joining one large string
+    with open(out_html, "w", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.write(head)
+        fh.writelines(_iter_findings_table(findings.get("findings", [])))
+        fh.write(middle)
+        fh.writelines(_iter_summary_table(rows))
+        fh.write(tail)
     return out_html
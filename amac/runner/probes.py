@@ -9,7 +9,12 @@ from rich.console import Console
 from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn
 
 from .._json import dumps
-from ..auth.flows import fetch_oauth2_token, perform_form_login, refresh_oauth2_token
+from ..auth.flows import aclose as aclose_auth_client
+from ..auth.flows import (
+    fetch_oauth2_token,
+    perform_form_login,
+    refresh_oauth2_token,
+)
 from ..config import assert_urls_in_scope
 
 # 🔧 import from package init to avoid module-attribute lookup issues
@@ -72,7 +77,7 @@ async def run_basic_probes(
     If dry_run=True, no requests are sent; we only compute planned counts and write a tiny summary.
     """
     # Scope/sanity
-    assert_urls_in_scope([e.url for e in endpoints.endpoints], scope)
+    assert_urls_in_scope([e.url_parts for e in endpoints.endpoints], scope)
 
     # IO setup
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -117,72 +122,75 @@ async def run_basic_probes(
     rp: RequestPolicy = scope.request_policy
     to: Timeouts = scope.timeouts
 
-    async with HttpClient(
-        timeouts=to,
-        max_rps=rp.max_rps,
-        concurrency=rp.concurrency,
-        per_host_concurrency=rp.per_host_concurrency,
-        user_agent="AMAC/0.2.0",
-        max_attempts=3,
-        backoff_base=0.6,
-        backoff_cap_s=rp.backoff_cap_s,
-        allow_redirects=rp.allow_redirects,
-        verify_tls=rp.verify_tls,
-        global_jitter_ms=rp.global_jitter_ms,
-        hard_request_budget=rp.hard_request_budget,
-        privacy_level=scope.evidence.privacy_level,  # privacy: none|minimal|strict
-    ) as client:
-        # Resolve dynamic auth (oauth2/form_login → bearer/cookie)
-        effective_identities: List[AuthScheme] = []
-        for s in auth_schemes:
-            eff = await _resolve_identity(s)
-            effective_identities.append(eff)
-
-        # Build tasks
-        legacy_rows: List[ProbeSummaryRow] = []
-        matrix_rows: List[Dict[str, Any]] = []
-
-        progress = Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("{task.completed}/{task.total}"),
-            TimeElapsedColumn(),
-            transient=True,
-            console=console,
-        )
-
-        BATCH = max(1, rp.concurrency * 6)
-        total = len(endpoints.endpoints)
-        completed = 0
-
-        with progress:
-            task_id = progress.add_task("Probing endpoints", total=total)
-
-            for batch_start in range(0, total, BATCH):
-                batch_eps = endpoints.endpoints[batch_start : batch_start + BATCH]
-                tasks = [
-                    asyncio.create_task(
-                        _probe_one(
-                            client,
-                            idx=(i + batch_start),
-                            ep=ep,
-                            identities=effective_identities,
-                            req_dir=req_dir,
-                        )
-                    )
-                    for i, ep in enumerate(batch_eps)
-                ]
+    try:
+        async with HttpClient(
+            timeouts=to,
+            max_rps=rp.max_rps,
+            concurrency=rp.concurrency,
+            per_host_concurrency=rp.per_host_concurrency,
+            user_agent="AMAC/0.2.0",
+            max_attempts=3,
+            backoff_base=0.6,
+            backoff_cap_s=rp.backoff_cap_s,
+            allow_redirects=rp.allow_redirects,
+            verify_tls=rp.verify_tls,
+            global_jitter_ms=rp.global_jitter_ms,
+            hard_request_budget=rp.hard_request_budget,
+            privacy_level=scope.evidence.privacy_level,  # privacy: none|minimal|strict
+        ) as client:
+            # Resolve dynamic auth (oauth2/form_login → bearer/cookie) for all identities at once
+            effective_identities: List[AuthScheme] = list(
+                await asyncio.gather(*(_resolve_identity(s) for s in auth_schemes))
+            )
 
-                for coro in asyncio.as_completed(tasks):
-                    legacy_row, matrix_row = await coro
-                    legacy_rows.append(legacy_row)
-                    matrix_rows.append(matrix_row)
-                    completed += 1
-                    progress.update(task_id, completed=completed)
+            # Build tasks
+            legacy_rows: List[ProbeSummaryRow] = []
+            matrix_rows: List[Dict[str, Any]] = []
+
+            progress = Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("{task.completed}/{task.total}"),
+                TimeElapsedColumn(),
+                transient=True,
+                console=console,
+            )
 
-        # Sort rows by index for determinism
-        legacy_rows.sort(key=lambda r: r.index)
-        matrix_rows.sort(key=lambda r: r["index"])
+            BATCH = max(1, rp.concurrency * 6)
+            total = len(endpoints.endpoints)
+            completed = 0
+
+            with progress:
+                task_id = progress.add_task("Probing endpoints", total=total)
+
+                for batch_start in range(0, total, BATCH):
+                    batch_eps = endpoints.endpoints[batch_start : batch_start + BATCH]
+                    tasks = [
+                        asyncio.create_task(
+                            _probe_one(
+                                client,
+                                idx=(i + batch_start),
+                                ep=ep,
+                                identities=effective_identities,
+                                req_dir=req_dir,
+                            )
+                        )
+                        for i, ep in enumerate(batch_eps)
+                    ]
+
+                    for coro in asyncio.as_completed(tasks):
+                        legacy_row, matrix_row = await coro
+                        legacy_rows.append(legacy_row)
+                        matrix_rows.append(matrix_row)
+                        completed += 1
+                        progress.update(task_id, completed=completed)
+
+            # Sort rows by index for determinism
+            legacy_rows.sort(key=lambda r: r.index)
+            matrix_rows.sort(key=lambda r: r["index"])
+    finally:
+        # Token/refresh requests are done; release the pooled auth-flow client
+        await aclose_auth_client()
 
     # Write summary
     summary_path = out_dir / "summary.json"
@@ -234,7 +242,7 @@ def _write_json(obj: Any, path: Path) -> None:
             payload = obj.__dict__  # dataclasses etc.
         except Exception:
             payload = obj
-    path.write_bytes(dumps(payload))
+    path.write_bytes(dumps(payload, indent=0))
 
 
 async def _resolve_identity(s: AuthScheme) -> AuthScheme:
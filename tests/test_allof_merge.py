@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from amac.discovery.refs import _Spec
+from amac.discovery.sampler import sample_schema_value
+
+
+def test_allof_samples_every_branch():
+    doc = _Spec({"components": {"schemas": {
+        "Base": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "integer"}, "kind": {"type": "string", "enum": ["a", "b"]}},
+        },
+        "Pet": {"allOf": [
+            {"$ref": "#/components/schemas/Base"},
+            {"required": ["name", "kind"], "properties": {"name": {"type": "string"}, "kind": {"enum": ["b", "c"]}}},
+        ]},
+    }}})
+    body = sample_schema_value({"$ref": "#/components/schemas/Pet"}, doc=doc)
+    assert set(body) == {"id", "name", "kind"}
+    assert body["kind"] == "b"
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+
+from amac import cli
+from amac._json import loads
+from amac.models import Endpoint, EndpointSet
+
+
+def test_identical_rewrite_keeps_mtime(tmp_path):
+    out = tmp_path / "out" / "endpoints.json"
+    es = EndpointSet(endpoints=[Endpoint(method="GET", url="https://api.example.com/x")])
+    cli._write_json(es, out)
+    os.utime(out, ns=(1_000_000_000, 1_000_000_000))
+
+    cli._write_json(es, out)
+    assert out.stat().st_mtime_ns == 1_000_000_000
+    assert loads(out.read_bytes()) == es.model_dump()
+
+
+def test_changed_content_is_fully_written(tmp_path, monkeypatch):
+    out = tmp_path / "summary.json"
+    big = {"rows": [{"i": i, "url": f"https://api.example.com/{i}"} for i in range(10_000)]}
+    assert len(cli.dumps(big, indent=0)) > 4 * cli._WRITE_CHUNK
+
+    # short writes must be resumed, not dropped
+    real_write = os.write
+    monkeypatch.setattr(cli.os, "write", lambda fd, buf: real_write(fd, buf[:1000]))
+    cli._write_json(big, out)
+    assert loads(out.read_bytes()) == big
+
+    # a smaller payload truncates what was there before
+    cli._write_json({"rows": []}, out)
+    assert out.read_bytes() == cli.dumps({"rows": []}, indent=0)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from amac import config
+from amac.config import load_scope_config
+
+SCOPE_YML = """\
+allowed:
+  - api.example.com
+base_urls:
+  - https://api.example.com
+path_policy:
+  allow_paths:
+    - " /v1/* "
+request_policy:
+  max_rps: "3"
+  backoff_cap_s: 2
+"""
+
+
+def test_scope_cache_rebuilds_validated_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("AMAC_CACHE_DIR", str(tmp_path / "cache"))
+    scope_path = tmp_path / "scope.yml"
+    scope_path.write_text(SCOPE_YML, encoding="utf-8")
+
+    first = load_scope_config(scope_path)
+    assert list((tmp_path / "cache" / "validated").glob("*.json"))
+
+    calls = []
+    monkeypatch.setattr(
+        config.ScopeConfig, "model_validate", classmethod(lambda cls, raw: calls.append(raw))
+    )
+    second = load_scope_config(scope_path)
+
+    assert calls == []  # served from the validated cache, not re-validated
+    assert second == first
+    assert second.path_policy.allow_paths == ["/v1/*"]
+    assert second.request_policy.max_rps == 3
+    assert second.request_policy.backoff_cap_s == 2.0
+
+
+def test_scope_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("AMAC_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    scope_path = tmp_path / "scope.yml"
+    scope_path.write_text(SCOPE_YML, encoding="utf-8")
+
+    load_scope_config(scope_path)
+    assert not (tmp_path / "xdg").exists()
+
+
+def test_scope_cache_ignores_foreign_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv("AMAC_CACHE_DIR", str(tmp_path / "cache"))
+    scope_path = tmp_path / "scope.yml"
+    scope_path.write_text(SCOPE_YML, encoding="utf-8")
+    load_scope_config(scope_path)
+    (entry,) = (tmp_path / "cache" / "validated").glob("*.json")
+
+    # an entry whose embedded digest does not match its name is re-validated
+    entry.write_text('{"digest": "x", "config": {"allowed": ["evil.example"]}}', encoding="utf-8")
+    assert load_scope_config(scope_path).allowed == ["api.example.com"]
+
+
+class _Inner(BaseModel):
+    n: int = 0
+
+
+class _Outer(BaseModel):
+    inner: _Inner
+    maybe: Optional[_Inner] = None
+    named: Dict[str, _Inner] = {}
+
+
+def test_construct_trusted_rebuilds_nested_annotations():
+    data = _Outer(inner=_Inner(n=1), maybe=_Inner(n=2), named={"a": _Inner(n=3)}).model_dump()
+    out = config._construct_trusted(_Outer, data)
+    assert isinstance(out.inner, _Inner)
+    assert isinstance(out.maybe, _Inner) and out.maybe.n == 2
+    assert isinstance(out.named["a"], _Inner) and out.named["a"].n == 3
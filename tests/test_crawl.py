@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from functools import partial
+
+import httpx
+import pytest
+
+from amac.discovery import crawl
+from amac.models import ScopeConfig
+
+SCOPE = ScopeConfig(allowed=["example.com"])
+BASE = "https://example.com"
+
+
+def _html(*hrefs: str) -> httpx.Response:
+    links = "".join(f'<a href="{h}">x</a>' for h in hrefs)
+    return httpx.Response(200, headers={"content-type": "text/html"}, text=f"<html>{links}</html>")
+
+
+def _crawl(monkeypatch, handler, **kwargs) -> crawl.CrawlResult:
+    monkeypatch.setattr(
+        crawl.httpx, "AsyncClient",
+        partial(httpx.AsyncClient, transport=httpx.MockTransport(handler)),
+    )
+    return asyncio.run(asyncio.wait_for(crawl.lightweight_discover([BASE], SCOPE, **kwargs), 10))
+
+
+def test_budget_caps_requests_started(monkeypatch):
+    hits = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits[request.url.path] += 1
+        n = len(hits)
+        # every page links to ten never-seen pages: only the budget stops the crawl
+        return _html(*(f"/p{n}-{i}" for i in range(10)))
+
+    result = _crawl(monkeypatch, handler, budget=5, max_concurrency=4)
+    assert sum(hits.values()) == 5
+    assert result.pages_fetched == 5
+
+
+def test_terminates_when_the_queue_drains(monkeypatch):
+    site = {
+        "/": _html("/a", "/b", "https://other.example.org/x"),
+        "/a": _html("/", "/b", "/c"),
+        "/b": _html("/a"),
+        "/c": _html(),
+    }
+    hits = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits[request.url.path] += 1
+        return site.get(request.url.path) or httpx.Response(404)
+
+    result = _crawl(monkeypatch, handler, budget=100)
+    # seeds are fetched but only links discovered from pages are reported
+    assert result.urls == [f"{BASE}/a", f"{BASE}/b", f"{BASE}/c"]
+    assert set(hits) == {"/", "/robots.txt", "/sitemap.xml", "/a", "/b", "/c"}
+    assert max(hits.values()) == 1
+    assert result.pages_fetched == 6
+
+
+def test_per_host_limit_bounds_in_flight_requests(monkeypatch):
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if request.url.path == "/":
+            return _html(*(f"/p{i}" for i in range(20)))
+        return _html()
+
+    result = _crawl(monkeypatch, handler, budget=50, max_concurrency=16, per_host=2)
+    assert result.pages_fetched == 23
+    assert peak == 2
+
+
+def test_links_are_deduped_on_their_canonical_form(monkeypatch):
+    hits = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits[request.url.path] += 1
+        if request.url.path == "/":
+            return _html("/a", "HTTPS://EXAMPLE.COM:443/a#top", "https://example.com/a#other")
+        return _html()
+
+    result = _crawl(monkeypatch, handler, budget=100)
+    assert hits["/a"] == 1
+    assert result.urls == [f"{BASE}/a"]
+
+
+def test_selectolax_hrefs_match_stdlib(monkeypatch):
+    pytest.importorskip("selectolax.lexbor")
+    page = (
+        '<html><head><base href="/"></head><body>'
+        '<a href="/a">a</a><A HREF="b?x=1&amp;y=2">b</A><a>no href</a>'
+        "<a href='/café'>c</a><div><a href=\"\">empty</a></div></body></html>"
+    ).encode("latin-1")
+    fast = crawl._extract_hrefs(page, "latin-1")
+    monkeypatch.setattr(crawl, "_FastHTMLParser", None)
+    assert fast == crawl._extract_hrefs(page, "latin-1") == ["/a", "b?x=1&y=2", "/café", ""]
+
+
+def test_links_deep_in_large_pages_are_kept(monkeypatch):
+    monkeypatch.setattr(crawl, "_FastHTMLParser", None)
+    page = b'<a href="/first">x</a>' + b"<p>filler</p>" * 100_000 + b'<a href="/last">y</a>'
+    assert crawl._extract_hrefs(page) == ["/first", "/last"]
+
+
+def test_a_failing_url_does_not_stall_the_crawl(monkeypatch):
+    sitemap = '<urlset><url><loc>https://[bad/x</loc></url></urlset>'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, headers={"content-type": "application/xml"}, text=sitemap)
+        if request.url.path == "/":
+            return _html("/a")
+        return _html()
+
+    # a single worker: if it died on the bad <loc>, the queue would never drain
+    result = _crawl(monkeypatch, handler, budget=100, max_concurrency=1)
+    assert result.urls == [f"{BASE}/a"]
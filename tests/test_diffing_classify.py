@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import importlib.util
+import json
+import sys
+
+import pytest
+
+from amac.diffing import compare
 from amac.diffing.compare import analyze_summary
 
 
@@ -54,3 +61,46 @@ def test_analyze_summary_basic_findings():
     assert by_type.get("SUSPECT_PRIVATE_ENDPOINT_OPEN", 0) == 1
 
     assert findings["counts"]["total_findings"] == 3
+
+
+def _compare_without(monkeypatch, module_name: str):
+    """A fresh copy of amac.diffing.compare imported as if `module_name` were not installed."""
+    monkeypatch.setitem(sys.modules, module_name, None)
+    spec = importlib.util.spec_from_file_location("_compare_fallback", compare.__file__)
+    mod = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, mod)  # dataclasses look their module up
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_msgspec_findings_match_dataclass_findings(tmp_path, monkeypatch):
+    pytest.importorskip("msgspec")
+    assert compare.msgspec is not None
+    fallback = _compare_without(monkeypatch, "msgspec")
+    assert fallback.msgspec is None
+
+    rows = [
+        {"method": "GET", "url": "https://api.example.com/private/x", "requires_auth": True,
+         "noauth_status": 200, "auth_status": 200, "noauth_size": 1000, "auth_size": 1020},
+        {"method": "GET", "url": "https://api.example.com/me", "requires_auth": None,
+         "noauth_status": 200, "auth_status": None, "noauth_size": None, "auth_size": 10},
+        {"method": "POST", "url": "https://api.example.com/ok", "requires_auth": True,
+         "noauth_status": 401, "auth_status": 200, "noauth_size": 5, "auth_size": 90},
+    ]
+    fast = compare.analyze_summary({"rows": rows})
+    slow = fallback.analyze_summary({"rows": rows})
+    assert fast["findings"] and fast["findings"] == slow["findings"]
+    assert fast["counts"] == slow["counts"]
+
+    outputs = []
+    for mod, name in ((compare, "fast"), (fallback, "slow")):
+        run_dir = tmp_path / name
+        run_dir.mkdir()
+        (run_dir / "summary.json").write_text(json.dumps({"rows": rows}), encoding="utf-8")
+        json_path, md_path = mod.analyze_run_dir(run_dir)
+        written = json.loads(json_path.read_text(encoding="utf-8"))
+        written.pop("generated_at")
+        md = [line for line in md_path.read_text(encoding="utf-8").splitlines()
+              if not line.startswith("- Generated:")]
+        outputs.append((written, md))
+    assert outputs[0] == outputs[1]
@@ -4,7 +4,10 @@ import asyncio
 from pathlib import Path
 import json
 
+import pytest
+
 from amac.config import load_scope_config
+from amac.discovery import openapi
 from amac.discovery.openapi import load_and_map_openapi
 
 
@@ -73,3 +76,35 @@ def test_map_openapi_post_body(tmp_path):
     )}
     body = es.endpoints[0].extra.get("body")
     assert body == {"name": "alice"}
+
+
+@pytest.mark.parametrize(
+    "spec_name, scope_name",
+    [
+        ("openapi_local.json", "scope_local.yml"),
+        ("openapi_servervars.json", "scope_servervars.yml"),
+        ("openapi.json", "scope.yml"),
+    ],
+)
+def test_streamed_mapping_matches_full_load(spec_name, scope_name, monkeypatch):
+    pytest.importorskip("ijson")
+    repo_root = Path(__file__).resolve().parents[1]
+    spec = str(repo_root / "examples" / spec_name)
+    scope_cfg = load_scope_config(str(repo_root / "examples" / scope_name))
+
+    full = asyncio.run(load_and_map_openapi(spec, scope_cfg))
+
+    monkeypatch.setattr(openapi, "_STREAM_MIN_BYTES", 0)
+    streamed_calls = []
+    real_open = openapi._open_streaming
+    monkeypatch.setattr(
+        openapi, "_open_streaming", lambda src: streamed_calls.append(src) or real_open(src)
+    )
+    monkeypatch.setattr(
+        openapi, "_load_spec", lambda *a, **k: pytest.fail("streaming path fell back to _load_spec")
+    )
+    streamed = asyncio.run(load_and_map_openapi(spec, scope_cfg))
+
+    assert streamed_calls == [spec]
+    assert full.endpoints
+    assert [e.model_dump() for e in streamed.endpoints] == [e.model_dump() for e in full.endpoints]
@@ -4,7 +4,7 @@ import asyncio
 from pathlib import Path
 
 from amac.config import load_scope_config
-from amac.discovery.openapi import load_and_map_openapi
+from amac.discovery.openapi import _build_query, load_and_map_openapi
 
 
 def test_server_variables_and_param_sampling():
@@ -27,3 +27,24 @@ def test_server_variables_and_param_sampling():
     assert ep.url.startswith("https://api.dev.local/v1/users/")
     # required query param 'q' should appear
     assert "?q=" in ep.url
+
+
+def test_query_values_are_percent_encoded():
+    params = [
+        ("amp", "a&b=c"),
+        ("sp", "x y"),
+        ("frag", "#f"),
+        ("dt", "2024-01-01T00:00:00Z"),
+        ("url", "https://e.com/p?x"),
+        ("mail", "u@e.com"),
+        ("uni", "ü"),
+        ("n", 5),
+        ("k e+y", "v+"),
+    ]
+    query = _build_query(tuple((name, lambda v=value: v) for name, value in params))
+    # '&', '=', '#', '?', '+' and spaces are escaped; ':', '/' and '@' stay readable
+    assert query == (
+        "?amp=a%26b%3Dc&sp=x%20y&frag=%23f&dt=2024-01-01T00:00:00Z"
+        "&url=https://e.com/p%3Fx&mail=u@e.com&uni=%C3%BC&n=5&k%20e%2By=v%2B"
+    )
+    assert _build_query(()) == ""
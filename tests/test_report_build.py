@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from amac.report import build
+
+GOLDEN = Path(__file__).resolve().parent / "data" / "report_golden.html"
+
+SUMMARY = {
+    "auth_used": ["bearer <admin>"],
+    "rows": [
+        {"index": 1, "method": "GET", "url": "https://api.example.com/users/1",
+         "requires_auth": True, "noauth_status": 401, "auth_name": "bearer",
+         "auth_status": 200, "noauth_size": 12, "auth_size": 345},
+        {"index": 2, "method": "GET", "url": "https://api.example.com/q?a=1&b=<script>'\"",
+         "requires_auth": False, "noauth_status": 200, "auth_name": "o'brien & co",
+         "auth_status": "2<3", "noauth_size": None, "auth_size": 0},
+        # missing requires_auth, auth_name, auth_status and auth_size
+        {"index": 3, "method": "HEAD", "url": "https://api.example.com/status",
+         "noauth_status": 200, "noauth_size": 0},
+    ],
+}
+
+FINDINGS = {
+    "counts": {
+        "total_endpoints": 3,
+        "total_findings": 2,
+        "by_severity": {"high": 1, "low": 1},
+        "by_type": {"LEAK<&>": 1, "OTHER": 1},
+    },
+    "findings": [
+        {"severity": "high", "type": "LEAK<&>", "method": "GET",
+         "url": "https://api.example.com/q?a=1&b=<script>", "noauth_status": 200,
+         "auth_status": 200, "delta_size": -3, "notes": "body says \"hi\" & 'bye'"},
+        # missing type, url, statuses, delta_size and notes
+        {"severity": "low", "method": "GET"},
+    ],
+}
+
+
+def _render(module, run_dir: Path) -> str:
+    """Render the fixture with `module`'s render_report, with run-specific bits replaced."""
+    run_dir.mkdir()
+    (run_dir / "summary.json").write_text(json.dumps(SUMMARY), encoding="utf-8")
+    (run_dir / "findings.json").write_text(json.dumps(FINDINGS), encoding="utf-8")
+    html = module.render_report(run_dir).read_text(encoding="utf-8")
+    return html.replace(str((run_dir / "requests").resolve()), "RUN_DIR/requests").replace(
+        str(run_dir), "RUN_DIR"
+    )
+
+
+def test_render_report_matches_golden(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, "_fmt_dt", lambda dt: "2026-01-01 00:00:00")
+    assert _render(build, tmp_path / "run") == GOLDEN.read_text(encoding="utf-8")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sys
+
+from amac.discovery.refs import _Spec
+from amac.discovery.sampler import validate_generated_body
+
+DOC = _Spec({
+    "components": {
+        "schemas": {
+            "Node": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "child": {"$ref": "#/components/schemas/Node"},
+                },
+            }
+        }
+    }
+})
+NODE = {"$ref": "#/components/schemas/Node"}
+
+
+def _chain(depth: int, leaf: dict) -> dict:
+    value = leaf
+    for _ in range(depth):
+        value = {"name": "n", "child": value}
+    return value
+
+
+def test_nesting_deeper_than_the_recursion_limit():
+    depth = sys.getrecursionlimit() * 3
+    assert validate_generated_body(_chain(depth, {"name": "leaf"}), NODE, DOC) == (True, None)
+
+    ok, error = validate_generated_body(_chain(depth, {"name": 3}), NODE, DOC)
+    assert not ok
+    assert error == "Property 'child': " * depth + "Property 'name': Expected string, got int"
+
+
+def test_first_missing_required_key_follows_schema_order():
+    schema = {"type": "object", "required": ["b", "a"], "properties": {"a": {"type": "string"}}}
+    assert validate_generated_body({}, schema) == (False, "Missing required property: b")
+    assert validate_generated_body({"b": 1}, schema) == (False, "Missing required property: a")
+
+
+def test_properties_are_checked_in_body_order():
+    schema = {
+        "type": "object",
+        "properties": {"x": {"type": "integer"}, "y": {"type": "boolean"}},
+    }
+    assert validate_generated_body({"y": "no", "x": "no"}, schema) == (
+        False, "Property 'y': Expected boolean, got str"
+    )
+
+
+def test_error_path_formatting():
+    schema = {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "additionalProperties": False,
+                    "properties": {"n": {"type": "integer", "maximum": 5}},
+                },
+            }
+        },
+    }
+    body = {"items": [{"n": 1}, {"n": 9}]}
+    assert validate_generated_body(body, schema) == (
+        False, "Property 'items': Array item 1: Property 'n': Value 9 is greater than maximum 5"
+    )
+    body = {"items": [{"n": 1, "extra": True}]}
+    assert validate_generated_body(body, schema) == (
+        False, "Property 'items': Array item 0: Additional property not allowed: extra"
+    )
+    assert validate_generated_body([], schema) == (False, "Expected object, got list")
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from amac import _yaml
+
+yaml = pytest.importorskip("yaml")
+
+
+def test_fallback_matches_pyyaml_on_scope_examples():
+    repo_root = Path(__file__).resolve().parents[1]
+    for p in sorted((repo_root / "examples").glob("scope*.yml")):
+        text = p.read_text(encoding="utf-8")
+        assert _yaml.safe_load(text) == yaml.safe_load(text), p.name
+
+
+def test_fallback_keeps_hash_inside_quotes():
+    text = 'a: "x # not a comment"  # real comment\nb: \'#1\'\nc: 3 # trailing\n'
+    assert _yaml.safe_load(text) == {"a": "x # not a comment", "b": "#1", "c": 3}